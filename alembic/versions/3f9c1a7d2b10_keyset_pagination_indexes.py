@@ -0,0 +1,45 @@
+"""keyset pagination indexes
+
+Revision ID: 3f9c1a7d2b10
+Revises: 87de4a9647b1
+Create Date: 2026-10-18 10:12:41.318204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f9c1a7d2b10'
+down_revision: Union[str, None] = '87de4a9647b1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        'blog_category',
+        sa.Column(
+            'created_at',
+            sa.DateTime(timezone=True),
+            server_default=sa.text('now()'),
+            nullable=False,
+        ),
+    )
+    op.create_index('ix_blog_created_at_id', 'blog', ['created_at', 'id'], unique=False)
+    op.create_index(
+        'ix_blog_category_created_at_id',
+        'blog_category',
+        ['created_at', 'id'],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_blog_category_created_at_id', table_name='blog_category')
+    op.drop_index('ix_blog_created_at_id', table_name='blog')
+    op.drop_column('blog_category', 'created_at')
@@ -0,0 +1,49 @@
+"""blog full text search
+
+Revision ID: 5b2e8d4c7a91
+Revises: 3f9c1a7d2b10
+Create Date: 2026-10-18 11:05:27.904415
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = '5b2e8d4c7a91'
+down_revision: Union[str, None] = '3f9c1a7d2b10'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        'blog',
+        sa.Column(
+            'search_vector',
+            postgresql.TSVECTOR(),
+            sa.Computed(
+                "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+                "setweight(to_tsvector('english', coalesce(short_desc, '')), 'B') || "
+                "setweight(to_tsvector('english', coalesce(content, '')), 'C')",
+                persisted=True,
+            ),
+            nullable=True,
+        ),
+    )
+    op.create_index(
+        'ix_blog_search_vector',
+        'blog',
+        ['search_vector'],
+        unique=False,
+        postgresql_using='gin',
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_blog_search_vector', table_name='blog', postgresql_using='gin')
+    op.drop_column('blog', 'search_vector')
@@ -0,0 +1,62 @@
+"""admin trigram search
+
+Revision ID: 9d4f1e6b3c28
+Revises: 5b2e8d4c7a91
+Create Date: 2026-10-18 11:48:13.562907
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9d4f1e6b3c28'
+down_revision: Union[str, None] = '5b2e8d4c7a91'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    op.create_index(
+        'ix_user_name_trgm',
+        'user',
+        ['name'],
+        unique=False,
+        postgresql_using='gin',
+        postgresql_ops={'name': 'gin_trgm_ops'},
+    )
+    op.create_index(
+        'ix_user_username_trgm',
+        'user',
+        ['username'],
+        unique=False,
+        postgresql_using='gin',
+        postgresql_ops={'username': 'gin_trgm_ops'},
+    )
+    op.create_index(
+        'ix_role_name_trgm',
+        'role',
+        ['name'],
+        unique=False,
+        postgresql_using='gin',
+        postgresql_ops={'name': 'gin_trgm_ops'},
+    )
+    op.create_index(
+        'ix_image_title_trgm',
+        'image',
+        ['title'],
+        unique=False,
+        postgresql_using='gin',
+        postgresql_ops={'title': 'gin_trgm_ops'},
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_image_title_trgm', table_name='image', postgresql_using='gin')
+    op.drop_index('ix_role_name_trgm', table_name='role', postgresql_using='gin')
+    op.drop_index('ix_user_username_trgm', table_name='user', postgresql_using='gin')
+    op.drop_index('ix_user_name_trgm', table_name='user', postgresql_using='gin')
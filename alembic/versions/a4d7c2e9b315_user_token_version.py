@@ -0,0 +1,33 @@
+"""user token version
+
+Revision ID: a4d7c2e9b315
+Revises: e2b8c4d6f713
+Create Date: 2026-10-18 16:21:09.527341
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a4d7c2e9b315'
+down_revision: Union[str, None] = 'e2b8c4d6f713'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        'user',
+        sa.Column(
+            'token_version', sa.Integer(), server_default='0', nullable=False
+        ),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('user', 'token_version')
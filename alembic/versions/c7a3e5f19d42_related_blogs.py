@@ -0,0 +1,41 @@
+"""related blogs
+
+Revision ID: c7a3e5f19d42
+Revises: 9d4f1e6b3c28
+Create Date: 2026-10-18 12:31:06.184520
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c7a3e5f19d42'
+down_revision: Union[str, None] = '9d4f1e6b3c28'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'related_blog',
+        sa.Column('blog_id', sa.Integer(), nullable=False),
+        sa.Column('related_id', sa.Integer(), nullable=False),
+        sa.Column('rank', sa.Integer(), nullable=False),
+        sa.Column('score', sa.Float(), nullable=False),
+        sa.ForeignKeyConstraint(['blog_id'], ['blog.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['related_id'], ['blog.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('blog_id', 'related_id'),
+    )
+    op.create_index(
+        'ix_related_blog_related_id', 'related_blog', ['related_id'], unique=False
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_related_blog_related_id', table_name='related_blog')
+    op.drop_table('related_blog')
@@ -0,0 +1,38 @@
+"""blog terms
+
+Revision ID: d8e1f3a6c927
+Revises: a4d7c2e9b315
+Create Date: 2026-10-18 18:02:44.610392
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd8e1f3a6c927'
+down_revision: Union[str, None] = 'a4d7c2e9b315'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'blog_term',
+        sa.Column('term', sa.String(length=64), nullable=False),
+        sa.Column('blog_id', sa.Integer(), nullable=False),
+        sa.Column('weight', sa.Float(), nullable=False),
+        sa.ForeignKeyConstraint(['blog_id'], ['blog.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('term', 'blog_id'),
+    )
+    op.create_index('ix_blog_term_blog_id', 'blog_term', ['blog_id'], unique=False)
+    # vectors and neighbours are recomputed by `python -m apps.blogs.related`
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_blog_term_blog_id', table_name='blog_term')
+    op.drop_table('blog_term')
@@ -0,0 +1,36 @@
+"""blog category updated_at
+
+Revision ID: e2b8c4d6f713
+Revises: c7a3e5f19d42
+Create Date: 2026-10-18 14:05:42.318204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e2b8c4d6f713'
+down_revision: Union[str, None] = 'c7a3e5f19d42'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        'blog_category',
+        sa.Column(
+            'updated_at',
+            sa.DateTime(timezone=True),
+            server_default=sa.text('now()'),
+            nullable=False,
+        ),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('blog_category', 'updated_at')
@@ -6,8 +6,10 @@ import string
 from typing import Annotated, Optional
 # Import Depends, Form, File, and UploadFile
 from fastapi import APIRouter, Depends, Form, File, UploadFile
+from sqlalchemy import update
+from sqlalchemy.orm import selectinload
 from apps.auth.enums import OtpPurpose
-from apps.auth.models import Otp
+from apps.auth.models import Otp, Profile, User
 from core.drive.abstracts import UploadFileOptions
 from .dtos import (
     AccountDetailRead,
@@ -53,23 +55,33 @@ async def update_account_detail(
 ):
     await account_policy.authorize_update_account_detail()
     current_user = await auth.get_user_or_raise()
-    await session.refresh(current_user, attribute_names=["profile"])
 
     # Use the arguments directly
-    current_user.name = name
+    profile_values = {}
     if about is not None:
-        current_user.profile.about = about
-        
+        profile_values["about"] = about
+
     if avatar:
         uploaded_avatar_url = await drive.upload_file(avatar, image_upload_options)
-        current_user.profile.avatar = uploaded_avatar_url
-
-    session.add(current_user)
-    session.add(current_user.profile)
+        profile_values["avatar"] = uploaded_avatar_url
+
+    if profile_values:
+        await session.execute(
+            update(Profile)
+            .where(Profile.user_id == current_user.id)
+            .values(**profile_values)
+        )
+    user = await session.scalar(
+        update(User)
+        .where(User.id == current_user.id)
+        .values(name=name)
+        .returning(User)
+        .options(selectinload(User.profile), selectinload(User.roles))
+        .execution_options(populate_existing=True)
+    )
     await session.commit()
-    await session.refresh(current_user, attribute_names=["profile", "updated_at"])
 
-    return current_user
+    return user
 
 
 @account_router.put("/change-email", response_model=AccountDetailRead)
@@ -129,9 +141,13 @@ async def change_password(
 ):
     await account_policy.authorize_change_password(form_data.account_password)
     current_user = await auth.get_user_or_raise()
-    current_user.password = hash_utils.get_hash(form_data.new_password)
-    session.add(current_user)
+    user = await session.scalar(
+        update(User)
+        .where(User.id == current_user.id)
+        .values(password=hash_utils.get_hash(form_data.new_password))
+        .returning(User)
+        .options(selectinload(User.profile), selectinload(User.roles))
+        .execution_options(populate_existing=True)
+    )
     await session.commit()
-    await session.refresh(current_user)
-    await session.refresh(current_user, attribute_names=["profile"])
-    return current_user
\ No newline at end of file
+    return user
\ No newline at end of file
@@ -2,17 +2,19 @@ from typing import Annotated
 from fastapi import APIRouter, Depends, Query, Request
 from fastapi.responses import RedirectResponse
 from jinja2 import FileSystemLoader
-from sqlalchemy import func, select, or_
+from sqlalchemy import select, or_
 from sqlalchemy.orm import selectinload
 from apps.auth.dependency import IsUserType
 from apps.auth.enums import UserType
 from core.db import SessionDependency
 from core.jinja.helpers import get_template_rederer
+from core.pagination import paginate
 from core.session_helpers import flash
 from .dtos import CreateBlogCategoryForm, DeleteBlogCategoryForm, BlogCategorysListQuery
 from ..config import get_config
 from apps.auth.dependency import AuthDependency
 from core.exceptions.common import BadRequestErrorException, NotFoundException
+from apps.blogs.indexing import category_deleted, category_saved
 from apps.blogs.models import BlogCategory
 
 
@@ -45,25 +47,21 @@ async def get_blog_categories(
             )
         )
 
-    count_query = select(func.count()).select_from(base_query.subquery())
-    total = await session.scalar(count_query)
-
-    paginated_query = base_query.limit(qs.per_page).offset((qs.page - 1) * qs.per_page)
-
-    results = await session.scalars(paginated_query)
-    blog_categories = results.all()
+    paginated = await paginate(
+        session,
+        qs,
+        base_query,
+        with_total=True,
+        count_strategy=config.admin_count_strategy,
+        count_cache_ttl=config.admin_count_cache_ttl,
+    )
 
     auth_user = await auth.get_user_or_raise()
     delete_form = DeleteBlogCategoryForm(meta={"csrf_context": request.session})
     ctx = dict(
         user=auth_user,
         delete_form=delete_form,
-        data=dict(
-            data=blog_categories,
-            page=qs.page,
-            per_page=qs.per_page,
-            total=total,
-        ),
+        data=paginated,
     )
 
     return render(request, "admin/blog_categories/index.html.j2", ctx)
@@ -109,6 +107,7 @@ async def create_blog_category(
         session.add(blog_category)
 
         await session.commit()
+        category_saved(blog_category)
         flash(request, "BlogCategory Created", "success")
         return RedirectResponse(request.url_for("admin.blog_categories"), 303)
 
@@ -169,6 +168,7 @@ async def edit_blog_category(
         session.add(blog_category)
 
         await session.commit()
+        category_saved(blog_category)
         flash(request, "BlogCategory Updated", "success")
         return RedirectResponse(request.url_for("admin.blog_categories"), 303)
 
@@ -186,6 +186,7 @@ async def delete_blog_category(id: int, request: Request, session: SessionDepend
         blog_category = await session.get_one(BlogCategory, id)
         await session.delete(blog_category)
         await session.commit()
+        category_deleted(id)
         flash(request, "BlogCategory deleted", "success")
         return RedirectResponse(request.url_for("admin.blog_categories"), 303)
     else:
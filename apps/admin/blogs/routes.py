@@ -2,17 +2,19 @@ from typing import Annotated
 from fastapi import APIRouter, Depends, Query, Request
 from fastapi.responses import RedirectResponse
 from jinja2 import FileSystemLoader
-from sqlalchemy import func, select, or_
+from sqlalchemy import select, or_
 from sqlalchemy.orm import selectinload
 from apps.auth.dependency import IsUserType
 from apps.auth.enums import UserType
 from core.db import SessionDependency
 from core.jinja.helpers import get_template_rederer
+from core.pagination import paginate
 from core.session_helpers import flash
 from .dtos import CreateBlogForm, DeleteBlogForm, BlogsListQuery
 from ..config import get_config
 from apps.auth.dependency import AuthDependency
 from core.exceptions.common import BadRequestErrorException, NotFoundException
+from apps.blogs.indexing import blog_deleted, blog_saved
 from apps.blogs.models import Blog, BlogCategory
 
 
@@ -47,25 +49,21 @@ async def get_blogs(
             )
         )
 
-    count_query = select(func.count()).select_from(base_query.subquery())
-    total = await session.scalar(count_query)
-
-    paginated_query = base_query.limit(qs.per_page).offset((qs.page - 1) * qs.per_page)
-
-    results = await session.scalars(paginated_query)
-    blogs = results.all()
+    paginated = await paginate(
+        session,
+        qs,
+        base_query,
+        with_total=True,
+        count_strategy=config.admin_count_strategy,
+        count_cache_ttl=config.admin_count_cache_ttl,
+    )
 
     auth_user = await auth.get_user_or_raise()
     delete_form = DeleteBlogForm(meta={"csrf_context": request.session})
     ctx = dict(
         user=auth_user,
         delete_form=delete_form,
-        data=dict(
-            data=blogs,
-            page=qs.page,
-            per_page=qs.per_page,
-            total=total,
-        ),
+        data=paginated,
     )
 
     return render(request, "admin/blogs/index.html.j2", ctx)
@@ -114,6 +112,7 @@ async def create_blog(
         session.add(blog)
 
         await session.commit()
+        blog_saved(blog)
         flash(request, "Blog Created", "success")
         return RedirectResponse(request.url_for("admin.blogs"), 303)
 
@@ -170,6 +169,7 @@ async def edit_blog(
         session.add(blog)
 
         await session.commit()
+        blog_saved(blog)
         flash(request, "Blog Updated", "success")
         return RedirectResponse(request.url_for("admin.blogs"), 303)
 
@@ -187,6 +187,7 @@ async def delete_blog(id: int, request: Request, session: SessionDependency):
         blog = await session.get_one(Blog, id)
         await session.delete(blog)
         await session.commit()
+        blog_deleted(id)
         flash(request, "Blog deleted", "success")
         return RedirectResponse(request.url_for("admin.blogs"), 303)
     else:
@@ -3,10 +3,13 @@ from pathlib import Path
 from typing import Annotated
 from fastapi import Depends
 from pydantic_settings import BaseSettings, SettingsConfigDict
+from core.pagination import CountStrategy
 
 
 class Config(BaseSettings):
     template_path: Path = Path(__file__).resolve().parent / "templates"
+    admin_count_strategy: CountStrategy = CountStrategy.EXACT
+    admin_count_cache_ttl: int = 60
 
     model_config = SettingsConfigDict(env_file=".env", extra="ignore")
 
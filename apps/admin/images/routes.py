@@ -2,7 +2,7 @@ from typing import Annotated
 from fastapi import APIRouter, Depends, File, HTTPException, Query, Request, UploadFile
 from fastapi.responses import RedirectResponse
 from jinja2 import FileSystemLoader
-from sqlalchemy import func, select, or_
+from sqlalchemy import select
 from apps.auth.dependency import IsUserType
 from core.drive.abstracts import UploadFileOptions
 from core.drive.base import DriveDependency
@@ -10,6 +10,8 @@ from apps.auth.enums import UserType
 from core.db import SessionDependency
 from apps.images.models import Image
 from core.jinja.helpers import get_template_rederer
+from core.pagination import paginate
+from core.search import trigram_search
 from core.session_helpers import flash
 from .dtos import CreateImageForm, DeleteImageForm, ImagesListQuery
 from ..config import get_config
@@ -44,27 +46,23 @@ async def get_images(
     base_query = select(Image)
 
     if qs.search:
-        base_query = base_query.where(or_(Image.title.ilike(f"%{qs.search}%")))
-
-    count_query = select(func.count()).select_from(base_query.subquery())
-    total = await session.scalar(count_query)
-
-    paginated_query = base_query.limit(qs.per_page).offset((qs.page - 1) * qs.per_page)
-
-    results = await session.scalars(paginated_query)
-    images = results.all()
+        base_query = trigram_search(base_query, qs.search, Image.title)
+
+    paginated = await paginate(
+        session,
+        qs,
+        base_query,
+        with_total=True,
+        count_strategy=config.admin_count_strategy,
+        count_cache_ttl=config.admin_count_cache_ttl,
+    )
 
     auth_user = await auth.get_user_or_raise()
     delete_form = DeleteImageForm(meta={"csrf_context": request.session})
     ctx = dict(
         user=auth_user,
         delete_form=delete_form,
-        data=dict(
-            data=images,
-            page=qs.page,
-            per_page=qs.per_page,
-            total=total,
-        ),
+        data=paginated,
     )
 
     return render(request, "admin/images/index.html.j2", ctx)
@@ -2,12 +2,15 @@ from typing import Annotated
 from fastapi import APIRouter, Depends, Query, Request
 from fastapi.responses import RedirectResponse
 from jinja2 import FileSystemLoader
-from sqlalchemy import func, select, or_
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
 from apps.auth.dependency import IsUserType
 from apps.auth.enums import UserType
 from core.db import SessionDependency
-from apps.auth.models import Role
+from apps.auth.models import Role, User, user_role_link
 from core.jinja.helpers import get_template_rederer
+from core.pagination import paginate
+from core.search import trigram_search
 from core.session_helpers import flash
 from .dtos import CreateRoleForm, DeleteRoleForm, RolesListQuery
 from ..config import get_config
@@ -27,6 +30,19 @@ render = get_template_rederer(
 )
 
 
+async def revoke_role_claims(session: AsyncSession, role_id: int) -> None:
+    """Bumps the token version of the role's users, their permission claims are stale"""
+    holders = select(user_role_link.c["user.id"]).where(
+        user_role_link.c.role_id == role_id
+    )
+    await session.execute(
+        update(User)
+        .where(User.id.in_(holders))
+        .values(token_version=User.token_version + 1)
+        .returning(User.id)
+    )
+
+
 @router.get("/", name="admin.roles")
 async def get_roles(
     request: Request,
@@ -37,27 +53,23 @@ async def get_roles(
     base_query = select(Role)
 
     if qs.search:
-        base_query = base_query.where(or_(Role.name.ilike(f"%{qs.search}%")))
-
-    count_query = select(func.count()).select_from(base_query.subquery())
-    total = await session.scalar(count_query)
-
-    paginated_query = base_query.limit(qs.per_page).offset((qs.page - 1) * qs.per_page)
-
-    results = await session.scalars(paginated_query)
-    roles = results.all()
+        base_query = trigram_search(base_query, qs.search, Role.name)
+
+    paginated = await paginate(
+        session,
+        qs,
+        base_query,
+        with_total=True,
+        count_strategy=config.admin_count_strategy,
+        count_cache_ttl=config.admin_count_cache_ttl,
+    )
 
     auth_user = await auth.get_user_or_raise()
     delete_form = DeleteRoleForm(meta={"csrf_context": request.session})
     ctx = dict(
         user=auth_user,
         delete_form=delete_form,
-        data=dict(
-            data=roles,
-            page=qs.page,
-            per_page=qs.per_page,
-            total=total,
-        ),
+        data=paginated,
     )
 
     return render(request, "admin/roles/index.html.j2", ctx)
@@ -137,7 +149,10 @@ async def edit_role(
             form.name.errors.append("Name already taken")
             return await render_template()
 
+        previous_permissions = set(role.permissions)
         form.populate_obj(role)
+        if set(role.permissions) != previous_permissions:
+            await revoke_role_claims(session, role.id)
         session.add(role)
 
         await session.commit()
@@ -156,6 +171,7 @@ async def delete_role(id: int, request: Request, session: SessionDependency):
 
     if delete_form.validate():
         role = await session.get_one(Role, id)
+        await revoke_role_claims(session, role.id)
         await session.delete(role)
         await session.commit()
         flash(request, "Role deleted", "success")
@@ -1,6 +1,8 @@
 from fastapi import APIRouter, Request, Depends
 from jinja2 import FileSystemLoader
-from apps.auth.dependency import is_authenticated
+from apps.auth.dependency import IsUserType, is_authenticated
+from apps.auth.enums import UserType
+from core.db import get_pool_stats, replica_engine
 from core.jinja.helpers import get_template_rederer
 from .users.routes import router as user_router
 from .auth.routes import router as auth_router
@@ -29,3 +31,15 @@ render = get_template_rederer(
 async def dashboard(request: Request, auth: AuthDependency):
     user = await auth.get_user_or_raise()
     return render(request, "admin/dashboard.html.j2", {"user": user})
+
+
+@router.get(
+    "/pool-stats",
+    name="admin.pool_stats",
+    dependencies=[Depends(IsUserType([UserType.SUPER_ADMIN]))],
+)
+async def pool_stats():
+    stats = {"primary": get_pool_stats()}
+    if replica_engine is not None:
+        stats["replica"] = get_pool_stats(replica_engine)
+    return stats
@@ -2,13 +2,16 @@ from typing import Annotated
 from fastapi import APIRouter, Depends, Query, Request
 from fastapi.responses import RedirectResponse
 from jinja2 import FileSystemLoader
-from sqlalchemy import func, select, or_
+from sqlalchemy import select
 from sqlalchemy.orm import selectinload
 from apps.auth.dependency import IsUserType
 from apps.auth.enums import UserType
-from core.db import SessionDependency
+from core import get_config as get_global_config
+from core.db import SessionDependency, StatementTimeout
 from apps.auth.models import Profile, Role, User
 from core.jinja.helpers import get_template_rederer
+from core.pagination import paginate
+from core.search import trigram_search
 from core.session_helpers import flash
 from apps.auth.dependency import hasPermission # <-- Add this import at the top
 from apps.auth.enums import Permissions # <-- Add this import at the top
@@ -25,13 +28,20 @@ router = APIRouter(
 )
 
 config = get_config()
+global_config = get_global_config()
 
 render = get_template_rederer(
     FileSystemLoader(str(config.template_path)),
 )
 
 
-@router.get("/", name="admin.users")
+@router.get(
+    "/",
+    name="admin.users",
+    dependencies=[
+        Depends(StatementTimeout(global_config.db_search_statement_timeout_ms))
+    ],
+)
 async def get_users(
     request: Request,
     session: SessionDependency,
@@ -41,31 +51,23 @@ async def get_users(
     base_query = select(User).options(selectinload(User.roles))
 
     if qs.search:
-        base_query = base_query.where(
-            or_(
-                User.name.ilike(f"%{qs.search}%"), User.username.ilike(f"%{qs.search}%")
-            )
-        )
-
-    count_query = select(func.count()).select_from(base_query.subquery())
-    total = await session.scalar(count_query)
-
-    paginated_query = base_query.limit(qs.per_page).offset((qs.page - 1) * qs.per_page)
-
-    results = await session.scalars(paginated_query)
-    users = results.all()
+        base_query = trigram_search(base_query, qs.search, User.name, User.username)
+
+    paginated = await paginate(
+        session,
+        qs,
+        base_query,
+        with_total=True,
+        count_strategy=config.admin_count_strategy,
+        count_cache_ttl=config.admin_count_cache_ttl,
+    )
 
     auth_user = await auth.get_user_or_raise()
     delete_form = DeleteUserForm(meta={"csrf_context": request.session})
     ctx = dict(
         user=auth_user,
         delete_form=delete_form,
-        data=dict(
-            data=users,
-            page=qs.page,
-            per_page=qs.per_page,
-            total=total,
-        ),
+        data=paginated,
     )
 
     return render(request, "admin/users/index.html.j2", ctx)
@@ -179,12 +181,16 @@ async def edit_user(
             form.username.errors.append("Username already taken")
             return await render_template()
 
+        previous_access = (user.user_type, user.is_active, {r.id for r in user.roles})
         form.populate_obj(user)
 
         roles = await session.scalars(
             select(Role).where(Role.id.in_(form.role_ids.data))
         )
         user.roles = list(roles.all())
+        access = (UserType(user.user_type), user.is_active, {r.id for r in user.roles})
+        if access != previous_access:
+            user.token_version += 1
         session.add(user)
 
         await session.commit()
@@ -1,12 +1,19 @@
 # In apps/auth/dependency.py
 # keep above lines as is
 
-from typing import Annotated
+from collections.abc import Iterable
+from typing import Annotated, Any
 from fastapi import Depends
 from sqlalchemy import select
-from sqlalchemy.orm import joinedload
+from sqlalchemy.orm import joinedload, make_transient_to_detached
+from sqlalchemy.orm.attributes import set_committed_value
+from sqlalchemy.ext.asyncio import AsyncSession
 from pydantic import BaseModel, ConfigDict
+from core import get_config
+from core.cache import Cache, get_cache
 from core.db import SessionDependency
+from core.invalidation import on_invalidate
+from core.singleflight import single_flight
 from core.exceptions.common import UnAuthorizedException, ForbiddenException
 from core.jwt import JwtUtilsDepedency
 from core.hash import HashUtillsDependency
@@ -28,6 +35,85 @@ class TokenData(BaseModel):
     username: str
 
 
+# cached with the user, the password hash is left out and read on demand
+USER_SNAPSHOT_COLUMNS = (
+    "id",
+    "name",
+    "username",
+    "email",
+    "is_active",
+    "email_verified",
+    "user_type",
+    "token_version",
+    "created_at",
+    "updated_at",
+)
+
+# bits follow the declaration order of `Permissions`, only ever append to it
+PERMISSION_BITS = {permission: 1 << bit for bit, permission in enumerate(Permissions)}
+
+
+def permission_bits(roles: Iterable[Role]) -> int:
+    bits = 0
+    for role in roles:
+        for permission in role.permissions:
+            bits |= PERMISSION_BITS.get(permission, 0)
+    return bits
+
+
+def permission_claims(user: User) -> dict[str, Any]:
+    """What `hasPermission` and `IsUserType` need, checked without loading the user"""
+    return dict(
+        ut=user.user_type.value,
+        perms=permission_bits(user.roles),
+        tv=user.token_version,
+    )
+
+
+def _user_cache() -> Cache:
+    return get_cache().namespace("auth_user")
+
+
+def _user_snapshot(user: User) -> dict:
+    return dict(
+        user={column: getattr(user, column) for column in USER_SNAPSHOT_COLUMNS},
+        roles=[
+            dict(id=role.id, name=role.name, permissions=list(role.permissions))
+            for role in user.roles
+        ],
+    )
+
+
+@single_flight("auth_user")
+async def _load_user_snapshot(session: AsyncSession, user_id: int) -> dict | None:
+    """Concurrent requests of a user share the query, each restores its own copy"""
+    user = await session.scalar(
+        select(User).where(User.id == user_id).options(joinedload(User.roles))
+    )
+    await session.release()
+    if user is None:
+        return None
+    snapshot = _user_snapshot(user)
+    await _user_cache().set(str(user_id), snapshot, get_config().auth_user_cache_ttl)
+    return snapshot
+
+
+# users are written through the users, roles and account routes, a shared
+# cache is cleared once by the writing worker
+@on_invalidate("user", remote=not get_cache().backend.shared)
+async def _forget_users(ids: list[int] | None) -> None:
+    if ids is None:
+        await _user_cache().clear()
+    elif ids:
+        await _user_cache().delete(*map(str, ids))
+
+
+@on_invalidate("role", remote=not get_cache().backend.shared)
+async def _forget_role_users(ids: list[int] | None) -> None:
+    # the users holding a role aren't tracked, roles change rarely enough
+    await _user_cache().clear()
+
+
 async def get_token(
     bearerToken: Annotated[str | None, Depends(oauth2_scheme)],
     cookie_auth_token: Annotated[str | None, Depends(cookie_token_scheme)],
@@ -58,14 +144,58 @@ class Auth:
         payload = self.jwt_utils.get_payload(self.token)
         if not payload:
             return None
-        user = await self.session.scalar(
-            select(User)
-            .where(User.id == payload.get("id"))
-            .options(joinedload(User.roles))
-        )
-        self.currentUser = user
+        user_id = payload.get("id")
+        snapshot = await _user_cache().get(str(user_id))
+        if snapshot is None:
+            snapshot = await _load_user_snapshot(self.session, user_id)
+        if snapshot is None:
+            return None
+        self.currentUser = await self._restore_user(snapshot)
         return self.currentUser
 
+    async def _restore_user(self, snapshot: dict) -> User:
+        """
+        Attaches the snapshot to the session as if the user had been loaded, so
+        routes can still refresh, modify and commit it. Nothing is queried.
+        """
+        roles = [Role(**role) for role in snapshot["roles"]]
+        user = User(**snapshot["user"])
+        for instance in (user, *roles):
+            make_transient_to_detached(instance)
+        # without firing the backref, `Role.users` stays unloaded
+        set_committed_value(user, "roles", roles)
+        return await self.session.merge(user, load=False)
+
+    async def get_claims(self) -> dict[str, Any] | None:
+        """
+        The permission claims of the token once its version is checked against
+        the user's, from the user cache when possible. `None` when claims are
+        disabled or the token has none, callers then check the user's roles.
+        """
+        if not get_config().jwt_permission_claims or not self.token:
+            return None
+        payload = self.jwt_utils.get_payload(self.token)
+        if not payload or "perms" not in payload:
+            return None
+
+        snapshot = await _user_cache().get(str(payload.get("id")))
+        if snapshot is not None:
+            token_version = snapshot["user"]["token_version"]
+        else:
+            user = await self.get_user()
+            token_version = user.token_version if user else None
+        if payload["tv"] != token_version:
+            raise UnAuthorizedException(msg="Permissions changed, please log in again")
+        return payload
+
+    async def verify_password(self, password: str) -> bool:
+        user = await self.get_user_or_raise()
+        password_hash = await self.session.scalar(
+            select(User.password).where(User.id == user.id)
+        )
+        await self.session.release()
+        return self.hash_utils.verify_hash(password, password_hash)
+
     async def get_user_or_raise(self) -> User:
         user = await self.get_user()
         if not user:
@@ -101,7 +231,10 @@ class Auth:
         print("[AUTH LOGIC] Password verified successfully. Creating JWT.")
 
         token_data = TokenData(username=user.username, id=user.id)
-        access_token = self.jwt_utils.create_access_token(token_data.model_dump())
+        claims = token_data.model_dump()
+        if get_config().jwt_permission_claims:
+            claims.update(permission_claims(user))
+        access_token = self.jwt_utils.create_access_token(claims)
         
         print("[AUTH LOGIC] JWT created. Returning data.")
         print("--- [AUTH LOGIC] login method finished ---\n")
@@ -130,6 +263,11 @@ class IsUserType:
         self.allowed_user_types = allowed_user_types
 
     async def __call__(self, auth: AuthDependency):
+        claims = await auth.get_claims()
+        if claims is not None:
+            if claims["ut"] not in self.allowed_user_types:
+                raise ForbiddenException()
+            return
         user = await auth.get_user_or_raise()
         if user.user_type.value not in self.allowed_user_types:
             raise ForbiddenException()
@@ -140,6 +278,11 @@ class hasPermission:
         self.permission = permission
 
     async def __call__(self, auth: AuthDependency):
+        claims = await auth.get_claims()
+        if claims is not None:
+            if not claims["perms"] & PERMISSION_BITS[Permissions(self.permission)]:
+                raise ForbiddenException()
+            return
         user = await auth.get_user_or_raise()
         is_allowed = False
         for role in user.roles:
@@ -1,7 +1,18 @@
 from datetime import datetime
 from typing import TYPE_CHECKING, List
 from core.base_model import BaseModel
-from sqlalchemy import Column, DateTime, String, func, ForeignKey, Boolean, Table, Text # <<< FIX: Import Text type
+from sqlalchemy import (
+    Column,
+    DateTime,
+    Index,
+    Integer,
+    String,
+    func,
+    ForeignKey,
+    Boolean,
+    Table,
+    Text,  # <<< FIX: Import Text type
+)
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy.dialects import postgresql
 from .enums import UserType, Permissions, OtpPurpose
@@ -32,6 +43,8 @@ class User(BaseModel):
     user_type: Mapped[UserType] = mapped_column(
         postgresql.ENUM(UserType), default=UserType.User
     )
+    # bumped when the user type or roles change, older permission claims are refused
+    token_version: Mapped[int] = mapped_column(Integer(), default=0, server_default="0")
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), server_default=func.now()
     )
@@ -56,6 +69,21 @@ class User(BaseModel):
         passive_deletes=True,
     )
 
+    __table_args__ = (
+        Index(
+            "ix_user_name_trgm",
+            "name",
+            postgresql_using="gin",
+            postgresql_ops={"name": "gin_trgm_ops"},
+        ),
+        Index(
+            "ix_user_username_trgm",
+            "username",
+            postgresql_using="gin",
+            postgresql_ops={"username": "gin_trgm_ops"},
+        ),
+    )
+
 
 class Role(BaseModel):
     __tablename__ = "role"
@@ -69,6 +97,15 @@ class Role(BaseModel):
         back_populates="roles", secondary=user_role_link
     )
 
+    __table_args__ = (
+        Index(
+            "ix_role_name_trgm",
+            "name",
+            postgresql_using="gin",
+            postgresql_ops={"name": "gin_trgm_ops"},
+        ),
+    )
+
 
 class Profile(BaseModel):
     __tablename__ = "profile"
@@ -1,13 +1,13 @@
 from datetime import datetime
-from pydantic import BaseModel, field_validator
-from core.dtos import PaginationQuery
+from pydantic import BaseModel, Field, field_validator
+from core.dtos import CursorPaginationQuery
 from core.responses import PaginatedResponse
 import re
 
 SLUG_REGEX = re.compile(r"^[a-z0-9]+(?:-[a-z0-9]+)*$")
 
 
-class BlogListQuery(PaginationQuery):
+class BlogListQuery(CursorPaginationQuery):
     search: str | None = None
 
 
@@ -28,15 +28,55 @@ class BlogRead(BaseModel):
     is_published: bool
     short_desc: str | None = None
     created_at: datetime
-    updated_at_at: datetime
+    updated_at: datetime
     category_id: int | None = None
     category: RelatedCategory | None = None
     thumbnail_id: int | None = None
     thumbnail: RelatedThumbnail | None = None
+    snippet: str | None = None
 
 
 class BlogListResponse(PaginatedResponse):
     data: list[BlogRead] = []
+    # corrected search when it matched nothing
+    suggestion: str | None = None
+
+
+class BlogRelatedResponse(BaseModel):
+    data: list[BlogRead] = []
+
+
+class BlogSearchQuery(BaseModel):
+    q: str
+    limit: int = Field(default=10, ge=1, le=50)
+
+
+class BlogSearchHit(BaseModel):
+    id: int
+    slug: str
+    title: str
+    short_desc: str | None = None
+    score: float
+
+
+class BlogSearchResponse(BaseModel):
+    data: list[BlogSearchHit] = []
+
+
+class BlogSuggestQuery(BaseModel):
+    q: str
+    limit: int = Field(default=8, ge=1, le=20)
+
+
+class BlogSuggestion(BaseModel):
+    type: str
+    id: int
+    slug: str
+    text: str
+
+
+class BlogSuggestResponse(BaseModel):
+    data: list[BlogSuggestion] = []
 
 
 class BlogCreate(BaseModel):
@@ -83,7 +123,7 @@ class BlogUpdate(BaseModel):
         return v
 
 
-class BlogCategoryListQuery(PaginationQuery):
+class BlogCategoryListQuery(CursorPaginationQuery):
     search: str | None = None
 
 
@@ -0,0 +1,173 @@
+"""
+In-process blog indexes, loaded once at startup and kept current by the write
+routes which report every committed change through the `*_saved` / `*_deleted` hooks.
+Blog changes also schedule the recompute of the precomputed related posts.
+Published slugs are mirrored into `blog_slug_index` for the detail route's fast 404s.
+Changes committed by other workers arrive as invalidations and are re-read.
+"""
+
+from pathlib import Path
+from sqlalchemy import select
+from core import get_config
+from core.db import async_session_factory
+from core.invalidation import on_invalidate
+from .models import Blog, BlogCategory
+from .related import schedule_related_refresh
+from .search_engine import BM25Index, SearchDocument
+from .slug_index import SlugIndex
+from .spelling import SpellingIndex
+from .suggest import PrefixIndex, Suggestion
+
+config = get_config()
+
+blog_search_index = BM25Index()
+blog_suggest_index = PrefixIndex()
+blog_spelling_index = SpellingIndex()
+blog_slug_index = SlugIndex(Path(config.root_path, config.slug_index_path))
+
+
+def _search_document(blog: Blog) -> SearchDocument:
+    return SearchDocument(
+        id=blog.id,
+        slug=blog.slug,
+        title=blog.title,
+        short_desc=blog.short_desc,
+        content=blog.content,
+    )
+
+
+def _blog_text(document: SearchDocument | Blog) -> str:
+    return " ".join(
+        filter(None, (document.title, document.short_desc, document.content))
+    )
+
+
+def _index_blog(document: SearchDocument) -> None:
+    previous = blog_search_index.get(document.id)
+    if previous is not None and previous.slug != document.slug:
+        blog_slug_index.remove(previous.slug)
+    blog_slug_index.add(document.slug)
+    blog_search_index.add(document)
+    blog_spelling_index.add(("blog", document.id), _blog_text(document))
+    blog_suggest_index.add(
+        Suggestion("blog", document.id, document.slug, document.title)
+    )
+
+
+def _unindex_blog(blog_id: int) -> None:
+    previous = blog_search_index.get(blog_id)
+    if previous is not None:
+        blog_slug_index.remove(previous.slug)
+    blog_search_index.remove(blog_id)
+    blog_suggest_index.remove("blog", blog_id)
+    blog_spelling_index.remove(("blog", blog_id))
+
+
+def _index_category(suggestion: Suggestion) -> None:
+    blog_suggest_index.add(suggestion)
+    blog_spelling_index.add(("category", suggestion.id), suggestion.text)
+
+
+def _unindex_category(category_id: int) -> None:
+    blog_suggest_index.remove("category", category_id)
+    blog_spelling_index.remove(("category", category_id))
+
+
+def blog_saved(blog: Blog) -> None:
+    if blog.is_published:
+        _index_blog(_search_document(blog))
+    else:
+        _unindex_blog(blog.id)
+    schedule_related_refresh(blog.id)
+
+
+def blog_deleted(blog_id: int) -> None:
+    _unindex_blog(blog_id)
+    schedule_related_refresh(blog_id)
+
+
+def category_saved(category: BlogCategory) -> None:
+    if category.is_published:
+        _index_category(
+            Suggestion("category", category.id, category.slug, category.name)
+        )
+    else:
+        _unindex_category(category.id)
+
+
+def category_deleted(category_id: int) -> None:
+    _unindex_category(category_id)
+
+
+@on_invalidate("blog", local=False)
+async def _sync_blogs(ids: list[int] | None) -> None:
+    if ids is None:
+        await load_blog_indexes()
+        return
+    async with async_session_factory() as session:
+        rows = await session.execute(
+            select(Blog.id, Blog.slug, Blog.title, Blog.short_desc, Blog.content).where(
+                Blog.id.in_(ids), Blog.is_published == True
+            )
+        )
+        documents = {row.id: SearchDocument(*row) for row in rows}
+    for id in ids:
+        if id in documents:
+            _index_blog(documents[id])
+        else:
+            _unindex_blog(id)
+
+
+@on_invalidate("blog_category", local=False)
+async def _sync_categories(ids: list[int] | None) -> None:
+    if ids is None:
+        await load_blog_indexes()
+        return
+    async with async_session_factory() as session:
+        rows = await session.execute(
+            select(BlogCategory.id, BlogCategory.slug, BlogCategory.name).where(
+                BlogCategory.id.in_(ids), BlogCategory.is_published == True
+            )
+        )
+        suggestions = {
+            id: Suggestion("category", id, slug, name) for id, slug, name in rows
+        }
+    for id in ids:
+        if id in suggestions:
+            _index_category(suggestions[id])
+        else:
+            _unindex_category(id)
+
+
+async def load_blog_indexes() -> None:
+    async with async_session_factory() as session:
+        rows = await session.execute(
+            select(Blog.id, Blog.slug, Blog.title, Blog.short_desc, Blog.content).where(
+                Blog.is_published == True
+            )
+        )
+        documents = [SearchDocument(*row) for row in rows]
+        categories = await session.execute(
+            select(BlogCategory.id, BlogCategory.slug, BlogCategory.name).where(
+                BlogCategory.is_published == True
+            )
+        )
+        suggestions = [
+            Suggestion("category", id, slug, name) for id, slug, name in categories
+        ]
+
+    blog_search_index.rebuild(documents)
+    blog_slug_index.rebuild(document.slug for document in documents)
+    suggestions.extend(
+        Suggestion("blog", document.id, document.slug, document.title)
+        for document in documents
+    )
+    blog_suggest_index.rebuild(suggestions)
+    blog_spelling_index.rebuild(
+        [(("blog", document.id), _blog_text(document)) for document in documents]
+        + [
+            (("category", suggestion.id), suggestion.text)
+            for suggestion in suggestions
+            if suggestion.type == "category"
+        ]
+    )
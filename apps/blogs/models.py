@@ -2,12 +2,22 @@ from datetime import datetime
 from typing import TYPE_CHECKING, List, Optional
 from core.base_model import BaseModel
 from sqlalchemy.dialects import postgresql
-from sqlalchemy import DateTime, String, func, ForeignKey
+from sqlalchemy import Computed, DateTime, Index, String, func, ForeignKey
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 if TYPE_CHECKING:
     from apps.images.models import Image
 
+BLOG_SEARCH_CONFIG = "english"
+
+# Title outranks the short description which outranks the body, kept in sync by
+# postgres itself so writes never have to think about it.
+BLOG_SEARCH_VECTOR = (
+    f"setweight(to_tsvector('{BLOG_SEARCH_CONFIG}', coalesce(title, '')), 'A') || "
+    f"setweight(to_tsvector('{BLOG_SEARCH_CONFIG}', coalesce(short_desc, '')), 'B') || "
+    f"setweight(to_tsvector('{BLOG_SEARCH_CONFIG}', coalesce(content, '')), 'C')"
+)
+
 
 class Blog(BaseModel):
     __tablename__ = "blog"
@@ -35,6 +45,50 @@ class Blog(BaseModel):
         ForeignKey("image.id", ondelete="SET NULL"), default=None
     )
     thumbnail: Mapped[Optional["Image"]] = relationship()
+    search_vector: Mapped[str] = mapped_column(
+        postgresql.TSVECTOR,
+        Computed(BLOG_SEARCH_VECTOR, persisted=True),
+        deferred=True,
+    )
+
+    __table_args__ = (
+        Index("ix_blog_created_at_id", "created_at", "id"),
+        Index("ix_blog_search_vector", "search_vector", postgresql_using="gin"),
+    )
+
+
+class RelatedBlog(BaseModel):
+    """Precomputed `related_id` neighbours of `blog_id`, best first by `rank`"""
+
+    __tablename__ = "related_blog"
+
+    blog_id: Mapped[int] = mapped_column(
+        ForeignKey("blog.id", ondelete="CASCADE"), primary_key=True
+    )
+    related_id: Mapped[int] = mapped_column(
+        ForeignKey("blog.id", ondelete="CASCADE"), primary_key=True
+    )
+    rank: Mapped[int]
+    score: Mapped[float]
+
+    __table_args__ = (Index("ix_related_blog_related_id", "related_id"),)
+
+
+class BlogTerm(BaseModel):
+    """
+    Stored TF-IDF vectors of the published blogs, one L2 normalised `weight` per
+    term of a post. Term-major, the primary key doubles as the postings list.
+    """
+
+    __tablename__ = "blog_term"
+
+    term: Mapped[str] = mapped_column(String(64), primary_key=True)
+    blog_id: Mapped[int] = mapped_column(
+        ForeignKey("blog.id", ondelete="CASCADE"), primary_key=True
+    )
+    weight: Mapped[float]
+
+    __table_args__ = (Index("ix_blog_term_blog_id", "blog_id"),)
 
 
 class BlogCategory(BaseModel):
@@ -48,8 +102,18 @@ class BlogCategory(BaseModel):
     meta_title: Mapped[str | None] = mapped_column(String(100), default=None)
     meta_keywords: Mapped[str | None] = mapped_column(String(100), default=None)
     meta_desc: Mapped[str | None] = mapped_column(String, default=None)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now()
+    )
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), onupdate=func.now()
+    )
     blogs: Mapped[List[Blog]] = relationship(back_populates="category")
     thumbnail_id: Mapped[int | None] = mapped_column(
         ForeignKey("image.id", ondelete="SET NULL")
     )
     thumbnail: Mapped[Optional["Image"]] = relationship()
+
+    __table_args__ = (
+        Index("ix_blog_category_created_at_id", "created_at", "id"),
+    )
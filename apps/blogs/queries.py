@@ -0,0 +1,166 @@
+from typing import Any
+from sqlalchemy import ColumnElement, Row, Select, String, cast, func, select
+from apps.images.models import Image
+from .models import BLOG_SEARCH_CONFIG, Blog, BlogCategory
+
+# Column projections for the hot public list endpoints, they select only what
+# the response DTOs need and skip ORM hydration (identity map, instrumentation,
+# the `content` TEXT column) entirely.
+
+
+def blog_list_query() -> Select:
+    return (
+        select(
+            Blog.id,
+            Blog.slug,
+            Blog.title,
+            Blog.is_published,
+            Blog.short_desc,
+            Blog.created_at,
+            Blog.updated_at,
+            Blog.category_id,
+            BlogCategory.name.label("category_name"),
+            Blog.thumbnail_id,
+            Image.url.label("thumbnail_url"),
+        )
+        .outerjoin(BlogCategory, Blog.category_id == BlogCategory.id)
+        .outerjoin(Image, Blog.thumbnail_id == Image.id)
+    )
+
+
+def search_blogs(query: Select, search: str) -> Select:
+    """
+    Narrows a blog list query to full text matches of `search` (websearch syntax:
+    quoted phrases, `or`, `-exclude`) served by the GIN index on `search_vector`,
+    best ranked first, with a highlighted `snippet` column.
+    """
+    ts_query = func.websearch_to_tsquery(BLOG_SEARCH_CONFIG, search)
+    snippet = func.ts_headline(
+        BLOG_SEARCH_CONFIG,
+        func.concat_ws(" ", Blog.short_desc, Blog.content),
+        ts_query,
+        "StartSel=<mark>, StopSel=</mark>, MaxWords=35, MinWords=15, MaxFragments=2",
+    )
+    return (
+        query.add_columns(snippet.label("snippet"))
+        .where(Blog.search_vector.bool_op("@@")(ts_query))
+        .order_by(func.ts_rank(Blog.search_vector, ts_query).desc(), Blog.id.desc())
+    )
+
+
+def blog_category_list_query() -> Select:
+    return select(
+        BlogCategory.id,
+        BlogCategory.slug,
+        BlogCategory.name,
+        BlogCategory.created_at,
+        BlogCategory.thumbnail_id,
+        Image.url.label("thumbnail_url"),
+    ).outerjoin(Image, BlogCategory.thumbnail_id == Image.id)
+
+
+# Version queries behind the ETag / Last-Modified validators. A list version is
+# a single value built from the count and the sum of per row hashes of
+# `(id, updated_at)` of the listed rows and their joined categories and
+# thumbnails. Unlike `max(updated_at)`, which is the transaction start time and
+# can stay put when a slow transaction commits an older row last, the sum moves
+# on every change, delete or visibility change. Lists are validated by their
+# ETag alone, a delete moves no modification date.
+
+
+def _row_hash(model: Any) -> ColumnElement:
+    return func.hashtext(
+        cast(model.id, String).concat(":").concat(cast(model.updated_at, String))
+    )
+
+
+def _list_version(*models: Any) -> ColumnElement:
+    parts = []
+    for model in models:
+        parts += [func.count(model.id), func.coalesce(func.sum(_row_hash(model)), 0)]
+    return func.concat_ws(":", *parts).label("version")
+
+
+def blog_list_version_query() -> Select:
+    return (
+        select(_list_version(Blog, BlogCategory, Image))
+        .select_from(Blog)
+        .outerjoin(BlogCategory, Blog.category_id == BlogCategory.id)
+        .outerjoin(Image, Blog.thumbnail_id == Image.id)
+    )
+
+
+def blog_version_query(slug: str) -> Select:
+    return (
+        select(
+            Blog.id,
+            Blog.is_published,
+            Blog.updated_at,
+            BlogCategory.id.label("category_id"),
+            BlogCategory.updated_at.label("category_updated_at"),
+            Image.id.label("thumbnail_id"),
+            Image.updated_at.label("thumbnail_updated_at"),
+        )
+        .outerjoin(BlogCategory, Blog.category_id == BlogCategory.id)
+        .outerjoin(Image, Blog.thumbnail_id == Image.id)
+        .where(Blog.slug == slug)
+    )
+
+
+def blog_category_list_version_query() -> Select:
+    return (
+        select(_list_version(BlogCategory, Image))
+        .select_from(BlogCategory)
+        .outerjoin(Image, BlogCategory.thumbnail_id == Image.id)
+    )
+
+
+def blog_category_version_query(slug: str) -> Select:
+    return (
+        select(
+            BlogCategory.id,
+            BlogCategory.is_published,
+            BlogCategory.updated_at,
+            Image.id.label("thumbnail_id"),
+            Image.updated_at.label("thumbnail_updated_at"),
+        )
+        .outerjoin(Image, BlogCategory.thumbnail_id == Image.id)
+        .where(BlogCategory.slug == slug)
+    )
+
+
+def _thumbnail(row: Row) -> dict[str, Any] | None:
+    if row.thumbnail_url is None:
+        return None
+    return {"id": row.thumbnail_id, "url": row.thumbnail_url}
+
+
+def blog_row_to_dict(row: Row) -> dict[str, Any]:
+    return {
+        "id": row.id,
+        "slug": row.slug,
+        "title": row.title,
+        "is_published": row.is_published,
+        "short_desc": row.short_desc,
+        "created_at": row.created_at,
+        "updated_at": row.updated_at,
+        "category_id": row.category_id,
+        "category": (
+            {"id": row.category_id, "name": row.category_name}
+            if row.category_name is not None
+            else None
+        ),
+        "thumbnail_id": row.thumbnail_id,
+        "thumbnail": _thumbnail(row),
+        "snippet": row._mapping.get("snippet"),
+    }
+
+
+def blog_category_row_to_dict(row: Row) -> dict[str, Any]:
+    return {
+        "id": row.id,
+        "slug": row.slug,
+        "name": row.name,
+        "thumbnail_id": row.thumbnail_id,
+        "thumbnail": _thumbnail(row),
+    }
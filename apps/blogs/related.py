@@ -0,0 +1,331 @@
+"""
+Related posts from the TF-IDF cosine similarity of the published blogs,
+precomputed into `related_blog` so article pages only read a handful of rows.
+
+Every post's vector is stored sparsely in `blog_term`, its `MAX_TERMS` heaviest
+terms with L2 normalised weights. Similarities are sums over the shared terms,
+computed by the database as a join of the postings, so neither a dense matrix
+nor the corpus is ever held in memory. Tokenizing and weighting run in a thread
+between sessions.
+
+`python -m apps.blogs.related` recomputes every post. Saves and deletes schedule
+`refresh_related` for just the changed posts plus the posts that listed them or
+that they now outrank, coalesced in the background.
+"""
+
+import asyncio
+import logging
+import math
+from collections import Counter
+from collections.abc import AsyncIterator
+from sqlalchemy import and_, delete, func, insert, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
+from core.cdn import get_cdn
+from core.db import async_session_factory
+from .models import Blog, BlogTerm, RelatedBlog
+from .search_engine import SearchDocument
+from .surrogate_keys import BLOG_RELATED
+
+logger = logging.getLogger(__name__)
+
+RELATED_COUNT = 5
+# terms kept per post, bounds the postings joined for a similarity
+MAX_TERMS = 64
+MAX_TERM_LENGTH = 64
+# terms in a larger share of the posts than this relate everything to everything
+MAX_DF_RATIO = 0.8
+# posts read, written or ranked per statement
+BATCH_SIZE = 500
+# saves within this window are recomputed together
+REFRESH_DELAY_SECONDS = 2
+
+_pending_refresh: set[int] = set()
+_refresh_task: asyncio.Task | None = None
+
+
+def term_counts(documents: list[SearchDocument]) -> list[Counter[str]]:
+    return [
+        Counter(
+            {
+                term: count
+                for term, count in document.terms().items()
+                if len(term) <= MAX_TERM_LENGTH
+            }
+        )
+        for document in documents
+    ]
+
+
+def term_weights(
+    counts: Counter[str], df: Counter[str], n_docs: int
+) -> dict[str, float]:
+    """
+    Sparse sublinear TF-IDF vector of a post, its `MAX_TERMS` heaviest terms
+    L2 normalised. Terms of more than `MAX_DF_RATIO` of the posts are dropped.
+    """
+    max_df = max(2, int(n_docs * MAX_DF_RATIO))
+    weights = {
+        term: (1 + math.log(count)) * (math.log((1 + n_docs) / (1 + df[term])) + 1)
+        for term, count in counts.items()
+        if df[term] <= max_df
+    }
+    top = sorted(weights.items(), key=lambda item: (-item[1], item[0]))[:MAX_TERMS]
+    norm = math.sqrt(sum(weight * weight for _, weight in top))
+    return {term: weight / norm for term, weight in top} if norm else {}
+
+
+def _similarities(blog_ids: list[int]):
+    """(`blog_id`, `related_id`, `score`) of every post sharing a term with `blog_ids`"""
+    source, other = aliased(BlogTerm), aliased(BlogTerm)
+    return (
+        select(
+            source.blog_id,
+            other.blog_id.label("related_id"),
+            func.sum(source.weight * other.weight).label("score"),
+        )
+        .join(other, and_(other.term == source.term, other.blog_id != source.blog_id))
+        .where(source.blog_id.in_(blog_ids))
+        .group_by(source.blog_id, other.blog_id)
+        .subquery()
+    )
+
+
+def neighbours_query(blog_ids: list[int]):
+    """The `RELATED_COUNT` nearest posts of `blog_ids`, as `related_blog` rows"""
+    pairs = _similarities(blog_ids)
+    position = (
+        func.row_number()
+        .over(
+            partition_by=pairs.c.blog_id,
+            order_by=(pairs.c.score.desc(), pairs.c.related_id),
+        )
+        .label("position")
+    )
+    ranked = select(pairs, position).subquery()
+    return select(
+        ranked.c.blog_id,
+        ranked.c.related_id,
+        (ranked.c.position - 1).label("rank"),
+        ranked.c.score,
+    ).where(ranked.c.position <= RELATED_COUNT)
+
+
+def _outranked_query(blog_ids: list[int]):
+    """Posts with a free slot or a weaker neighbour than one of `blog_ids`"""
+    pairs = _similarities(blog_ids)
+    stats = (
+        select(
+            RelatedBlog.blog_id,
+            func.count().label("count"),
+            func.min(RelatedBlog.score).label("weakest"),
+        )
+        .where(RelatedBlog.blog_id.in_(select(pairs.c.related_id)))
+        .group_by(RelatedBlog.blog_id)
+        .subquery()
+    )
+    return (
+        select(pairs.c.related_id)
+        .outerjoin(stats, stats.c.blog_id == pairs.c.related_id)
+        .where(
+            or_(
+                stats.c.count.is_(None),
+                stats.c.count < RELATED_COUNT,
+                pairs.c.score > stats.c.weakest,
+            )
+        )
+        .distinct()
+    )
+
+
+async def _load_documents(
+    session: AsyncSession, *criteria, limit: int | None = None
+) -> list[SearchDocument]:
+    rows = await session.execute(
+        select(Blog.id, Blog.slug, Blog.title, Blog.short_desc, Blog.content)
+        .where(Blog.is_published == True, *criteria)
+        .order_by(Blog.id)
+        .limit(limit)
+    )
+    return [SearchDocument(*row) for row in rows]
+
+
+async def _document_batches() -> AsyncIterator[list[SearchDocument]]:
+    """The published posts `BATCH_SIZE` at a time, each batch read by its own session"""
+    last_id = 0
+    while True:
+        async with async_session_factory() as session:
+            documents = await _load_documents(
+                session, Blog.id > last_id, limit=BATCH_SIZE
+            )
+        if not documents:
+            return
+        yield documents
+        last_id = documents[-1].id
+
+
+async def _document_frequencies(
+    session: AsyncSession, terms: list[str], excluded: list[int]
+) -> Counter[str]:
+    df: Counter[str] = Counter()
+    for start in range(0, len(terms), BATCH_SIZE):
+        rows = await session.execute(
+            select(BlogTerm.term, func.count())
+            .where(
+                BlogTerm.term.in_(terms[start : start + BATCH_SIZE]),
+                BlogTerm.blog_id.not_in(excluded),
+            )
+            .group_by(BlogTerm.term)
+        )
+        df.update(dict(rows.all()))
+    return df
+
+
+async def _store_vectors(
+    session: AsyncSession,
+    documents: list[SearchDocument],
+    vectors: list[dict[str, float]],
+) -> None:
+    await session.execute(
+        delete(BlogTerm).where(BlogTerm.blog_id.in_([d.id for d in documents]))
+    )
+    values = [
+        dict(term=term, blog_id=document.id, weight=weight)
+        for document, vector in zip(documents, vectors)
+        for term, weight in vector.items()
+    ]
+    if values:
+        await session.execute(insert(BlogTerm), values)
+
+
+async def _store_neighbours(session: AsyncSession, blog_ids: list[int]) -> None:
+    """Replaces the neighbours of `blog_ids` from their stored vectors"""
+    for start in range(0, len(blog_ids), BATCH_SIZE):
+        batch = blog_ids[start : start + BATCH_SIZE]
+        await session.execute(delete(RelatedBlog).where(RelatedBlog.blog_id.in_(batch)))
+        await session.execute(
+            insert(RelatedBlog).from_select(
+                ["blog_id", "related_id", "rank", "score"], neighbours_query(batch)
+            )
+        )
+
+
+async def rebuild_related() -> None:
+    """
+    Two passes over the posts, the first counts the exact document frequencies,
+    the second stores the vectors. Neighbours are then ranked a batch at a time.
+    """
+    df: Counter[str] = Counter()
+    n_docs = 0
+    async for documents in _document_batches():
+        counts = await asyncio.to_thread(term_counts, documents)
+        n_docs += len(documents)
+        for document_counts in counts:
+            df.update(document_counts.keys())
+
+    published: list[int] = []
+    async for documents in _document_batches():
+        counts = await asyncio.to_thread(term_counts, documents)
+        vectors = await asyncio.to_thread(
+            lambda: [term_weights(c, df, n_docs) for c in counts]
+        )
+        async with async_session_factory() as session:
+            await _store_vectors(session, documents, vectors)
+            await session.commit()
+        published.extend(document.id for document in documents)
+
+    async with async_session_factory() as session:
+        # deleted rows cascade, unpublished posts are dropped here
+        unpublished = select(Blog.id).where(Blog.is_published == False)
+        await session.execute(delete(BlogTerm).where(BlogTerm.blog_id.in_(unpublished)))
+        await session.execute(
+            delete(RelatedBlog).where(
+                or_(
+                    RelatedBlog.blog_id.in_(unpublished),
+                    RelatedBlog.related_id.in_(unpublished),
+                )
+            )
+        )
+        await session.commit()
+    for start in range(0, len(published), BATCH_SIZE):
+        async with async_session_factory() as session:
+            await _store_neighbours(session, published[start : start + BATCH_SIZE])
+            await session.commit()
+
+
+async def refresh_related(changed_ids: set[int]) -> None:
+    """
+    Stores the vectors of the changed posts and recomputes their neighbours and
+    those of every post whose list they were in or now belong in. Document
+    frequencies are counted over the stored vectors, so the idf of untouched
+    posts drifts slightly until the next full rebuild.
+    """
+    changed = sorted(changed_ids)
+    async with async_session_factory() as session:
+        documents = await _load_documents(session, Blog.id.in_(changed))
+        n_docs = await session.scalar(
+            select(func.count()).select_from(Blog).where(Blog.is_published == True)
+        )
+    counts = await asyncio.to_thread(term_counts, documents)
+
+    terms = sorted(set().union(*counts))
+    async with async_session_factory() as session:
+        df = await _document_frequencies(session, terms, changed)
+    for document_counts in counts:
+        df.update(document_counts.keys())
+    vectors = await asyncio.to_thread(
+        lambda: [term_weights(c, df, n_docs) for c in counts]
+    )
+
+    published = [document.id for document in documents]
+    # deleted or unpublished
+    gone = [id for id in changed if id not in published]
+    async with async_session_factory() as session:
+        affected = set(
+            await session.scalars(
+                select(RelatedBlog.blog_id).where(RelatedBlog.related_id.in_(changed))
+            )
+        )
+        await session.execute(delete(BlogTerm).where(BlogTerm.blog_id.in_(gone)))
+        await session.execute(
+            delete(RelatedBlog).where(
+                or_(RelatedBlog.blog_id.in_(gone), RelatedBlog.related_id.in_(gone))
+            )
+        )
+        if documents:
+            await _store_vectors(session, documents, vectors)
+            affected.update(published)
+            affected.update(await session.scalars(_outranked_query(published)))
+        await _store_neighbours(session, sorted(affected - set(gone)))
+        await session.commit()
+
+
+def schedule_related_refresh(blog_id: int) -> None:
+    global _refresh_task
+    _pending_refresh.add(blog_id)
+    if _refresh_task is None or _refresh_task.done():
+        _refresh_task = asyncio.get_running_loop().create_task(_run_pending_refresh())
+
+
+async def _run_pending_refresh() -> None:
+    while _pending_refresh:
+        await asyncio.sleep(REFRESH_DELAY_SECONDS)
+        changed_ids = set(_pending_refresh)
+        _pending_refresh.clear()
+        try:
+            await refresh_related(changed_ids)
+        except Exception:
+            logger.exception("Refreshing related blogs of %s failed", changed_ids)
+            continue
+        await get_cdn().purge(BLOG_RELATED)
+
+
+async def main() -> None:
+    await rebuild_related()
+    print("Related blogs rebuilt")
+
+
+if __name__ == "__main__":
+    import apps.load_model  # noqa
+
+    asyncio.run(main())
@@ -1,12 +1,57 @@
 # In apps/blogs/routes.py
 
 from typing import Annotated
-from fastapi import APIRouter, Depends, Query
-from sqlalchemy import func, select
+from fastapi import APIRouter, Depends, Query, Request, Response
+from sqlalchemy import Select, insert, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.engine import Row
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+from core.cdn import set_surrogate_keys
 from core.exceptions.common import FieldValidationError, NotFoundException
-from .models import Blog, BlogCategory
+from core.http_cache import (
+    is_not_modified,
+    latest,
+    make_etag,
+    not_modified,
+    set_validators,
+)
+from core.pagination import paginate, paginate_by_cursor
+from core.responses import PaginatedResponse
+from core.singleflight import single_flight
+from .models import Blog, BlogCategory, RelatedBlog
+from .indexing import (
+    blog_deleted,
+    blog_saved,
+    blog_search_index,
+    blog_slug_index,
+    blog_spelling_index,
+    blog_suggest_index,
+    category_deleted,
+    category_saved,
+)
 from .blog_policy import BlogPolicyDependency
 from .blog_category_policy import BlogCategoryPolicyDependency
+from .surrogate_keys import (
+    BLOG_LIST,
+    BLOG_RELATED,
+    BLOGS,
+    CATEGORIES,
+    CATEGORY_LIST,
+    blog_keys,
+    category_keys,
+)
+from .queries import (
+    blog_category_list_query,
+    blog_category_list_version_query,
+    blog_category_row_to_dict,
+    blog_category_version_query,
+    blog_list_query,
+    blog_list_version_query,
+    blog_row_to_dict,
+    blog_version_query,
+    search_blogs,
+)
 from .dtos import (
     BlogCategoryCreate,
     BlogCategoryListQuery,
@@ -17,9 +62,20 @@ from .dtos import (
     BlogListQuery,
     BlogListResponse,
     BlogRead,
+    BlogRelatedResponse,
+    BlogSearchQuery,
+    BlogSearchResponse,
+    BlogSuggestQuery,
+    BlogSuggestResponse,
     BlogUpdate,
 )
-from core.db import SessionDependency
+from core import get_config
+from core.db import (
+    ReadSessionDependency,
+    SessionDependency,
+    StatementTimeout,
+    violated_unique_constraint,
+)
 # New Imports needed for the fix
 from apps.auth.dependency import AuthDependency
 from apps.auth.enums import UserType
@@ -27,122 +83,331 @@ from apps.auth.enums import UserType
 
 blog_router = APIRouter(tags=["Blogs"], prefix="/blogs")
 blog_category_router = APIRouter(tags=["Blogs"], prefix="/blog_categories")
+config = get_config()
 
+BLOG_SLUG_CONSTRAINT = "blog_slug_key"
+BLOG_CATEGORY_SLUG_CONSTRAINT = "blog_category_slug_key"
 
-@blog_router.get("/", response_model=BlogListResponse)
-async def get_blogs(
-    qs: Annotated[BlogListQuery, Query()],
-    session: SessionDependency,
-    # CORRECTED: Removed the incorrect default value.
-    auth: AuthDependency,
-):
-    base_query = select(Blog)
 
-    # Check if the current user is an admin or super admin
-    user = await auth.get_user()
-    is_admin = user and user.user_type in [UserType.Admin, UserType.SUPER_ADMIN]
+# admin responses include unpublished rows, no CDN may store them
+ADMIN_CACHE_CONTROL = "private, no-cache"
 
+
+def _visibility(is_admin) -> str:
+    # admins get unpublished rows too, their validators must never match a visitor's
+    return "admin" if is_admin else "public"
+
+
+def _edge_cache(response: Response, keys: list[str], is_admin=False) -> Response:
+    cache_control = ADMIN_CACHE_CONTROL if is_admin else config.cdn_cache_control
+    set_surrogate_keys(response, keys, cache_control)
+    return response
+
+
+# Concurrent identical reads share one query through these single flights.
+# They return rows and DTOs, the ORM instances belong to the first caller's session.
+# Flights are per engine, clients pinned to the primary never share a replica read.
+
+
+def _blog_list_version_query(is_admin: bool) -> Select:
+    query = blog_list_version_query()
+    if not is_admin:
+        query = query.where(Blog.is_published == True)
+    return query
+
+
+@single_flight("blogs.list_version")
+async def _blog_list_version(session: AsyncSession, is_admin: bool) -> str:
+    return await session.scalar(_blog_list_version_query(is_admin))
+
+
+@single_flight("blogs.list")
+async def _list_blogs(
+    session: AsyncSession, qs: BlogListQuery, is_admin: bool
+) -> tuple[PaginatedResponse, str]:
+    """The page and the list version, read by the page statement itself"""
+    version = _blog_list_version_query(is_admin).scalar_subquery().correlate(None)
+    base_query = blog_list_query().add_columns(version.label("version"))
     # If the user is NOT an admin, only show published blogs
     if not is_admin:
         base_query = base_query.where(Blog.is_published == True)
 
     if qs.search:
-        base_query = base_query.where(Blog.title.ilike(f"%{qs.search}%"))
+        # Relevance ordered, so it can't be paged by the created_at keyset
+        result = await paginate(session, qs, search_blogs(base_query, qs.search))
+    elif qs.cursor_mode:
+        result = await paginate_by_cursor(session, base_query, qs, Blog)
+    else:
+        result = await paginate(
+            session, qs, base_query.order_by(Blog.created_at.desc(), Blog.id.desc())
+        )
+    if result.data:
+        version = result.data[0].version
+    else:
+        version = await _blog_list_version(session, is_admin)
+    result.data = [blog_row_to_dict(row) for row in result.data]
+    return result, version
 
-    count_query = select(func.count()).select_from(base_query.subquery())
-    total = await session.scalar(count_query)
 
-    paginated_query = base_query.limit(qs.per_page).offset((qs.page - 1) * qs.per_page)
+@single_flight("blogs.version")
+async def _blog_version(session: AsyncSession, slug: str) -> Row | None:
+    return (await session.execute(blog_version_query(slug))).one_or_none()
 
-    results = await session.scalars(paginated_query)
-    blogs = results.all()
 
-    response = {
-        "data": blogs,
-        "page": qs.page,
-        "per_page": qs.per_page,
-        "total": total,
-    }
-    return response
+@single_flight("blogs.detail")
+async def _load_blog(session: AsyncSession, slug: str) -> BlogRead | None:
+    blog = await session.scalar(
+        select(Blog)
+        .where(Blog.slug == slug)
+        .options(selectinload(Blog.category), selectinload(Blog.thumbnail))
+    )
+    return BlogRead.model_validate(blog, from_attributes=True) if blog else None
+
+
+def _category_list_version_query(is_admin: bool) -> Select:
+    query = blog_category_list_version_query()
+    if not is_admin:
+        query = query.where(BlogCategory.is_published == True)
+    return query
+
+
+@single_flight("blog_categories.list_version")
+async def _category_list_version(session: AsyncSession, is_admin: bool) -> str:
+    return await session.scalar(_category_list_version_query(is_admin))
+
+
+@single_flight("blog_categories.list")
+async def _list_categories(
+    session: AsyncSession, qs: BlogCategoryListQuery, is_admin: bool
+) -> tuple[PaginatedResponse, str]:
+    """The page and the list version, read by the page statement itself"""
+    version = _category_list_version_query(is_admin).scalar_subquery().correlate(None)
+    base_query = blog_category_list_query().add_columns(version.label("version"))
+    # If the user is NOT an admin, only show published categories
+    if not is_admin:
+        base_query = base_query.where(BlogCategory.is_published == True)
+    if qs.search:
+        base_query = base_query.where(BlogCategory.name.ilike(f"%{qs.search}%"))
+
+    if qs.cursor_mode:
+        result = await paginate_by_cursor(session, base_query, qs, BlogCategory)
+    else:
+        result = await paginate(
+            session,
+            qs,
+            base_query.order_by(BlogCategory.created_at.desc(), BlogCategory.id.desc()),
+        )
+    if result.data:
+        version = result.data[0].version
+    else:
+        version = await _category_list_version(session, is_admin)
+    result.data = [blog_category_row_to_dict(row) for row in result.data]
+    return result, version
+
+
+@single_flight("blog_categories.version")
+async def _category_version(session: AsyncSession, slug: str) -> Row | None:
+    return (
+        await session.execute(blog_category_version_query(slug))
+    ).one_or_none()
+
+
+@single_flight("blog_categories.detail")
+async def _load_category(session: AsyncSession, slug: str) -> BlogCategoryRead | None:
+    category = await session.scalar(
+        select(BlogCategory)
+        .where(BlogCategory.slug == slug)
+        .options(selectinload(BlogCategory.thumbnail))
+    )
+    if not category:
+        return None
+    return BlogCategoryRead.model_validate(category, from_attributes=True)
+
+
+@blog_router.get(
+    "/",
+    response_model=BlogListResponse,
+    dependencies=[Depends(StatementTimeout(config.db_search_statement_timeout_ms))],
+)
+async def get_blogs(
+    qs: Annotated[BlogListQuery, Query()],
+    request: Request,
+    response: Response,
+    session: ReadSessionDependency,
+    # CORRECTED: Removed the incorrect default value.
+    auth: AuthDependency,
+):
+    # Check if the current user is an admin or super admin
+    user = await auth.get_user()
+    is_admin = bool(user and user.user_type in [UserType.Admin, UserType.SUPER_ADMIN])
+
+    scope = ("blogs", _visibility(is_admin), request.url.query)
+    keys = [BLOGS, BLOG_LIST]
+    # only a revalidation pays for a separate version query, a full response
+    # reads the version with the page in one statement
+    if "if-none-match" in request.headers:
+        etag = make_etag(*scope, await _blog_list_version(session, is_admin))
+        if is_not_modified(request, etag):
+            await session.release()
+            return _edge_cache(not_modified(etag), keys, is_admin)
+
+    result, version = await _list_blogs(session, qs, is_admin)
+    await session.release()
+    etag = make_etag(*scope, version)
+    if qs.search and not result.data and qs.page == 1:
+        result = BlogListResponse(
+            **result.model_dump(), suggestion=blog_spelling_index.correct(qs.search)
+        )
+    set_validators(response, etag)
+    _edge_cache(response, keys, is_admin)
+    return result
+
+
+@blog_router.get("/search", response_model=BlogSearchResponse)
+async def search_published_blogs(
+    qs: Annotated[BlogSearchQuery, Query()], response: Response
+):
+    # answered from the in-process BM25 index, no database round trip
+    _edge_cache(response, [BLOGS, BLOG_LIST])
+    return {"data": blog_search_index.search(qs.q, qs.limit)}
+
+
+@blog_router.get("/suggest", response_model=BlogSuggestResponse)
+async def suggest_blogs(qs: Annotated[BlogSuggestQuery, Query()], response: Response):
+    # typeahead for published titles and category names, served from memory
+    _edge_cache(response, [BLOGS, BLOG_LIST, CATEGORIES, CATEGORY_LIST])
+    return {"data": blog_suggest_index.suggest(qs.q, qs.limit)}
 
 
 @blog_router.get("/{slug}", response_model=BlogRead)
 async def get_blog(
     slug: str,
-    session: SessionDependency,
+    request: Request,
+    response: Response,
+    session: ReadSessionDependency,
     # CORRECTED: Removed the incorrect default value.
     auth: AuthDependency,
 ):
-    blog = await session.scalar(select(Blog).where(Blog.slug == slug))
-
-    if not blog:
+    # Anonymous readers only see published blogs, an unknown slug needs no query.
+    # Tokens may belong to admins, who can read drafts that aren't in the index.
+    if not auth.token and blog_slug_index.loaded and slug not in blog_slug_index:
         raise NotFoundException()
 
     # Check if the current user is an admin or super admin
     user = await auth.get_user()
-    is_admin = user and user.user_type in [UserType.Admin, UserType.SUPER_ADMIN]
+    is_admin = bool(user and user.user_type in [UserType.Admin, UserType.SUPER_ADMIN])
 
+    version = await _blog_version(session, slug)
     # If the blog is not published AND the user is not an admin, hide it
-    if not blog.is_published and not is_admin:
+    if version is None or (not version.is_published and not is_admin):
+        await session.release()
+        raise NotFoundException()
+
+    etag = make_etag("blog", _visibility(is_admin), *version)
+    last_modified = latest(*version)
+    keys = blog_keys(version.id, version.category_id, version.thumbnail_id)
+    if is_not_modified(request, etag, last_modified):
+        await session.release()
+        return _edge_cache(not_modified(etag, last_modified), keys, is_admin)
+
+    blog = await _load_blog(session, slug)
+    await session.release()
+
+    if not blog:
         raise NotFoundException()
 
+    set_validators(response, etag, last_modified)
+    _edge_cache(response, keys, is_admin)
     return blog
 
 
+@blog_router.get("/{slug}/related", response_model=BlogRelatedResponse)
+async def get_related_blogs(
+    slug: str, response: Response, session: ReadSessionDependency
+):
+    # precomputed by apps.blogs.related, indexed reads only
+    blog_id = await session.scalar(
+        select(Blog.id).where(Blog.slug == slug, Blog.is_published == True)
+    )
+    if blog_id is None:
+        await session.release()
+        raise NotFoundException()
+    rows = await session.execute(
+        blog_list_query()
+        .join(RelatedBlog, RelatedBlog.related_id == Blog.id)
+        .where(
+            RelatedBlog.blog_id == blog_id,
+            RelatedBlog.score > 0,
+            Blog.is_published == True,
+        )
+        .order_by(RelatedBlog.rank)
+    )
+    await session.release()
+    _edge_cache(response, [BLOGS, BLOG_LIST, BLOG_RELATED])
+    return {"data": [blog_row_to_dict(row) for row in rows]}
+
+
 @blog_category_router.get("/", response_model=BlogCategoryListResponse)
 async def get_categories(
     qs: Annotated[BlogCategoryListQuery, Query()],
-    session: SessionDependency,
+    request: Request,
+    response: Response,
+    session: ReadSessionDependency,
     # CORRECTED: Removed the incorrect default value.
     auth: AuthDependency,
 ):
-    base_query = select(BlogCategory)
-
     user = await auth.get_user()
-    is_admin = user and user.user_type in [UserType.Admin, UserType.SUPER_ADMIN]
+    is_admin = bool(user and user.user_type in [UserType.Admin, UserType.SUPER_ADMIN])
 
-    # If the user is NOT an admin, only show published categories
-    if not is_admin:
-        base_query = base_query.where(BlogCategory.is_published == True)
+    scope = ("blog_categories", _visibility(is_admin), request.url.query)
+    keys = [CATEGORIES, CATEGORY_LIST]
+    if "if-none-match" in request.headers:
+        etag = make_etag(*scope, await _category_list_version(session, is_admin))
+        if is_not_modified(request, etag):
+            await session.release()
+            return _edge_cache(not_modified(etag), keys, is_admin)
 
-    if qs.search:
-        base_query = base_query.where(BlogCategory.name.ilike(f"%{qs.search}%"))
-
-    count_query = select(func.count()).select_from(base_query.subquery())
-    total = await session.scalar(count_query)
-
-    paginated_query = base_query.limit(qs.per_page).offset((qs.page - 1) * qs.per_page)
-    results = await session.scalars(paginated_query)
-    categories = results.all()
-
-    response = {
-        "data": categories,
-        "page": qs.page,
-        "per_page": qs.per_page,
-        "total": total,
-    }
-    return response
+    result, version = await _list_categories(session, qs, is_admin)
+    await session.release()
+    etag = make_etag(*scope, version)
+    set_validators(response, etag)
+    _edge_cache(response, keys, is_admin)
+    return result
 
 
 @blog_category_router.get("/{slug}", response_model=BlogCategoryRead)
 async def get_blog_category(
     slug: str,
-    session: SessionDependency,
+    request: Request,
+    response: Response,
+    session: ReadSessionDependency,
     # CORRECTED: Removed the incorrect default value.
     auth: AuthDependency,
 ):
-    category = await session.scalar(select(BlogCategory).where(BlogCategory.slug == slug))
+    user = await auth.get_user()
+    is_admin = bool(user and user.user_type in [UserType.Admin, UserType.SUPER_ADMIN])
 
-    if not category:
+    version = await _category_version(session, slug)
+    # If the category is not published AND the user is not an admin, hide it
+    if version is None or (not version.is_published and not is_admin):
+        await session.release()
         raise NotFoundException()
 
-    user = await auth.get_user()
-    is_admin = user and user.user_type in [UserType.Admin, UserType.SUPER_ADMIN]
+    etag = make_etag("blog_category", _visibility(is_admin), *version)
+    last_modified = latest(*version)
+    keys = category_keys(version.id, version.thumbnail_id)
+    if is_not_modified(request, etag, last_modified):
+        await session.release()
+        return _edge_cache(not_modified(etag, last_modified), keys, is_admin)
 
-    # If the category is not published AND the user is not an admin, hide it
-    if not category.is_published and not is_admin:
+    category = await _load_category(session, slug)
+    await session.release()
+
+    if not category:
         raise NotFoundException()
-        
+
+    set_validators(response, etag, last_modified)
+    _edge_cache(response, keys, is_admin)
     return category
 
 # --- The Create, Update, and Delete routes below are unchanged ---
@@ -154,16 +419,20 @@ async def create_blog(
     blog_policy: BlogPolicyDependency,
 ):
     await blog_policy.authorize_create_blogs()
-    slug_exist = await session.scalar(select(Blog).where(Blog.slug == form_data.slug))
-
-    if slug_exist:
-        raise FieldValidationError("body", field_name="slug", msg="Slug Already taken")
-
-    blog = Blog(**form_data.model_dump())
-
-    session.add(blog)
-    await session.commit()
-    await session.refresh(blog)
+    try:
+        blog = await session.scalar(
+            insert(Blog)
+            .values(**form_data.model_dump())
+            .returning(Blog)
+            .options(selectinload(Blog.category), selectinload(Blog.thumbnail))
+        )
+        await session.commit()
+    except IntegrityError as e:
+        await session.rollback()
+        if violated_unique_constraint(e) == BLOG_SLUG_CONSTRAINT:
+            raise FieldValidationError("body", field_name="slug", msg="Slug Already taken")
+        raise
+    blog_saved(blog)
     return blog
 
 
@@ -175,25 +444,25 @@ async def update_blog(
     blog_policy: BlogPolicyDependency,
 ):
     await blog_policy.authorize_update_blogs()
-    blog = await session.scalar(select(Blog).where(Blog.slug == slug))
-
-    if not blog:
-        raise NotFoundException()
-
-    changed_slug_exist = await session.scalar(
-        select(Blog).where(Blog.slug == form_data.slug, Blog.id != blog.id)
-    )
-
-    if changed_slug_exist:
-        raise FieldValidationError("body", field_name="slug", msg="Slug Already taken")
-
     data = form_data.model_dump(exclude_unset=True)
-    for key, value in data.items():
-        setattr(blog, key, value)
-
-    session.add(blog)
-    await session.commit()
-    await session.refresh(blog)
+    try:
+        blog = await session.scalar(
+            update(Blog)
+            .where(Blog.slug == slug)
+            .values(**data)
+            .returning(Blog)
+            .options(selectinload(Blog.category), selectinload(Blog.thumbnail))
+            .execution_options(populate_existing=True)
+        )
+        if not blog:
+            raise NotFoundException()
+        await session.commit()
+    except IntegrityError as e:
+        await session.rollback()
+        if violated_unique_constraint(e) == BLOG_SLUG_CONSTRAINT:
+            raise FieldValidationError("body", field_name="slug", msg="Slug Already taken")
+        raise
+    blog_saved(blog)
     return blog
 
 
@@ -211,6 +480,7 @@ async def delete_blog(
 
     await session.delete(blog)
     await session.commit()
+    blog_deleted(blog.id)
     return None
 
 
@@ -221,18 +491,20 @@ async def create_blog_category(
     blog_category_policy: BlogCategoryPolicyDependency,
 ):
     await blog_category_policy.authorize_create_blog_category()
-    slug_exist = await session.scalar(
-        select(BlogCategory).where(BlogCategory.slug == form_data.slug)
-    )
-
-    if slug_exist:
-        raise FieldValidationError("body", field_name="slug", msg="Slug Already taken")
-
-    category = BlogCategory(**form_data.model_dump())
-
-    session.add(category)
-    await session.commit()
-    await session.refresh(category)
+    try:
+        category = await session.scalar(
+            insert(BlogCategory)
+            .values(**form_data.model_dump())
+            .returning(BlogCategory)
+            .options(selectinload(BlogCategory.thumbnail))
+        )
+        await session.commit()
+    except IntegrityError as e:
+        await session.rollback()
+        if violated_unique_constraint(e) == BLOG_CATEGORY_SLUG_CONSTRAINT:
+            raise FieldValidationError("body", field_name="slug", msg="Slug Already taken")
+        raise
+    category_saved(category)
     return category
 
 
@@ -244,27 +516,25 @@ async def update_blog_category(
     blog_category_policy: BlogCategoryPolicyDependency,
 ):
     await blog_category_policy.authorize_update_blog_category()
-    category = await session.scalar(select(BlogCategory).where(BlogCategory.slug == slug))
-
-    if not category:
-        raise NotFoundException()
-
-    changed_slug_exist = await session.scalar(
-        select(BlogCategory).where(
-            BlogCategory.slug == form_data.slug, BlogCategory.id != category.id
-        )
-    )
-
-    if changed_slug_exist:
-        raise FieldValidationError("body", field_name="slug", msg="Slug Already taken")
-
     data = form_data.model_dump(exclude_unset=True)
-    for key, value in data.items():
-        setattr(category, key, value)
-
-    session.add(category)
-    await session.commit()
-    await session.refresh(category)
+    try:
+        category = await session.scalar(
+            update(BlogCategory)
+            .where(BlogCategory.slug == slug)
+            .values(**data)
+            .returning(BlogCategory)
+            .options(selectinload(BlogCategory.thumbnail))
+            .execution_options(populate_existing=True)
+        )
+        if not category:
+            raise NotFoundException()
+        await session.commit()
+    except IntegrityError as e:
+        await session.rollback()
+        if violated_unique_constraint(e) == BLOG_CATEGORY_SLUG_CONSTRAINT:
+            raise FieldValidationError("body", field_name="slug", msg="Slug Already taken")
+        raise
+    category_saved(category)
     return category
 
 
@@ -282,4 +552,5 @@ async def delete_blog_category(
 
     await session.delete(category)
     await session.commit()
+    category_deleted(category.id)
     return None
\ No newline at end of file
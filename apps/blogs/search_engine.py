@@ -0,0 +1,305 @@
+"""
+In-process BM25 search over the published blogs.
+
+Postings are kept term-major like a CSC sparse matrix: a compacted base segment
+(`indptr` / `slots` / `weights` numpy arrays) plus a small append-only delta for
+the documents written since the last compaction. Removed or replaced documents
+are tombstoned in an `alive` mask and physically dropped on the next compaction,
+so writes never rewrite the arrays and queries only touch the postings of their terms.
+
+The length normalised BM25 term weight of every base posting is precomputed at
+compaction time (with the average document length frozen until the next one),
+scoring a query is then a slice, a multiply by the idf and a `bincount` per term.
+"""
+
+import math
+import re
+from collections import Counter
+from dataclasses import dataclass
+import numpy as np
+
+TOKEN_REGEX = re.compile(r"[a-z0-9]+")
+TAG_REGEX = re.compile(r"<[^>]+>")
+
+STOP_WORDS = frozenset(
+    (
+        "a an and are as at be but by for from has have in is it its of on or "
+        "that the this to was were will with"
+    ).split()
+)
+
+# title terms count as if they appeared this many times
+TITLE_WEIGHT = 3
+SHORT_DESC_WEIGHT = 2
+
+# compact once the delta or the tombstones reach this share of the index
+COMPACT_RATIO = 0.25
+COMPACT_MIN = 1024
+
+# above one matching posting per this many documents scores are summed densely
+DENSE_RATIO = 8
+
+
+def tokenize(text: str | None) -> list[str]:
+    if not text:
+        return []
+    tokens = TOKEN_REGEX.findall(TAG_REGEX.sub(" ", text).lower())
+    return [token for token in tokens if token not in STOP_WORDS]
+
+
+@dataclass(slots=True)
+class SearchDocument:
+    id: int
+    slug: str
+    title: str
+    short_desc: str | None = None
+    content: str | None = None
+
+    def terms(self) -> Counter[str]:
+        counts = Counter(tokenize(self.content))
+        for token in tokenize(self.short_desc):
+            counts[token] += SHORT_DESC_WEIGHT
+        for token in tokenize(self.title):
+            counts[token] += TITLE_WEIGHT
+        return counts
+
+
+@dataclass(slots=True)
+class SearchHit:
+    id: int
+    slug: str
+    title: str
+    short_desc: str | None
+    score: float
+
+
+class BM25Index:
+    def __init__(self, k1: float = 1.2, b: float = 0.75) -> None:
+        self.k1 = k1
+        self.b = b
+        self._reset()
+
+    def _reset(self) -> None:
+        self._vocab: dict[str, int] = {}
+        self._df: list[int] = []
+        self._doc_slot: dict[int, int] = {}
+        self._docs: list[SearchDocument | None] = []
+        self._doc_terms: list[tuple[np.ndarray, np.ndarray] | None] = []
+        self._doc_len = np.zeros(0, dtype=np.float32)
+        self._alive = np.zeros(0, dtype=bool)
+        self._total_len = 0
+        self._dead = 0
+
+        self._avg_len = 0.0
+        self._indptr = np.zeros(1, dtype=np.int64)
+        self._slots = np.zeros(0, dtype=np.int32)
+        self._weights = np.zeros(0, dtype=np.float32)
+        # term -> (slots, tfs) written since the last compaction
+        self._delta: dict[int, tuple[list[int], list[float]]] = {}
+        self._delta_size = 0
+
+    def __len__(self) -> int:
+        return len(self._doc_slot)
+
+    def __contains__(self, id: int) -> bool:
+        return id in self._doc_slot
+
+    def get(self, id: int) -> SearchDocument | None:
+        slot = self._doc_slot.get(id)
+        return self._docs[slot] if slot is not None else None
+
+    def rebuild(self, documents: list[SearchDocument]) -> None:
+        self._reset()
+        for document in documents:
+            self._add(document)
+        self._compact()
+
+    def add(self, document: SearchDocument) -> None:
+        """Indexes `document`, replacing any previous version with the same id"""
+        self._remove(document.id)
+        self._add(document)
+        self._maybe_compact()
+
+    def remove(self, id: int) -> None:
+        self._remove(id)
+        self._maybe_compact()
+
+    def _term_id(self, term: str) -> int:
+        term_id = self._vocab.get(term)
+        if term_id is None:
+            term_id = self._vocab[term] = len(self._df)
+            self._df.append(0)
+        return term_id
+
+    def _grow(self, size: int) -> None:
+        if size <= len(self._alive):
+            return
+        capacity = max(size, 2 * len(self._alive), 64)
+        self._doc_len = np.resize(self._doc_len, capacity)
+        alive = np.zeros(capacity, dtype=bool)
+        alive[: len(self._alive)] = self._alive
+        self._alive = alive
+
+    def _add(self, document: SearchDocument) -> None:
+        counts = document.terms()
+        slot = len(self._docs)
+        self._grow(slot + 1)
+
+        term_ids = np.fromiter(
+            (self._term_id(term) for term in counts), dtype=np.int32, count=len(counts)
+        )
+        tfs = np.fromiter(counts.values(), dtype=np.float32, count=len(counts))
+        for term_id, tf in zip(term_ids.tolist(), tfs.tolist()):
+            self._df[term_id] += 1
+            slots, term_tfs = self._delta.setdefault(term_id, ([], []))
+            slots.append(slot)
+            term_tfs.append(tf)
+        self._delta_size += len(counts)
+
+        length = float(tfs.sum())
+        # the body is only needed for its terms, don't keep it alive
+        self._docs.append(
+            SearchDocument(document.id, document.slug, document.title, document.short_desc)
+        )
+        self._doc_terms.append((term_ids, tfs))
+        self._doc_len[slot] = length
+        self._alive[slot] = True
+        self._doc_slot[document.id] = slot
+        self._total_len += length
+
+    def _remove(self, id: int) -> None:
+        slot = self._doc_slot.pop(id, None)
+        if slot is None:
+            return
+        term_ids, _ = self._doc_terms[slot]
+        for term_id in term_ids.tolist():
+            self._df[term_id] -= 1
+        self._total_len -= float(self._doc_len[slot])
+        self._alive[slot] = False
+        self._docs[slot] = None
+        self._doc_terms[slot] = None
+        self._dead += 1
+
+    def _maybe_compact(self) -> None:
+        threshold = max(COMPACT_MIN, int(len(self._slots) * COMPACT_RATIO))
+        if self._delta_size > threshold or self._dead > max(
+            COMPACT_MIN, int(len(self._docs) * COMPACT_RATIO)
+        ):
+            self._compact()
+
+    def _weigh(self, tfs: np.ndarray, doc_len: np.ndarray, avg_len: float) -> np.ndarray:
+        norm = self.k1 * (1 - self.b + self.b * doc_len / avg_len)
+        return (tfs * (self.k1 + 1) / (tfs + norm)).astype(np.float32)
+
+    def _compact(self) -> None:
+        """Renumbers the live documents and merges every posting into the base segment"""
+        docs = [doc for doc in self._docs if doc is not None]
+        doc_terms = [terms for terms in self._doc_terms if terms is not None]
+        size = len(docs)
+
+        doc_len = np.zeros(size, dtype=np.float32)
+        term_ids, slots, tfs = [], [], []
+        for slot, (doc_term_ids, doc_tfs) in enumerate(doc_terms):
+            term_ids.append(doc_term_ids)
+            tfs.append(doc_tfs)
+            slots.append(np.full(len(doc_term_ids), slot, dtype=np.int32))
+            doc_len[slot] = doc_tfs.sum()
+
+        if size:
+            self._avg_len = float(doc_len.mean())
+            all_terms = np.concatenate(term_ids)
+            order = np.argsort(all_terms, kind="stable")
+            self._slots = np.concatenate(slots)[order]
+            self._weights = self._weigh(
+                np.concatenate(tfs)[order], doc_len[self._slots], self._avg_len
+            )
+            counts = np.bincount(all_terms, minlength=len(self._df))
+        else:
+            self._avg_len = 0.0
+            self._slots = np.zeros(0, dtype=np.int32)
+            self._weights = np.zeros(0, dtype=np.float32)
+            counts = np.zeros(len(self._df), dtype=np.int64)
+
+        self._indptr = np.concatenate(([0], np.cumsum(counts)))
+        self._docs = docs
+        self._doc_terms = doc_terms
+        self._doc_slot = {doc.id: slot for slot, doc in enumerate(docs)}
+        self._doc_len = doc_len
+        self._alive = np.ones(size, dtype=bool)
+        self._delta = {}
+        self._delta_size = 0
+        self._dead = 0
+
+    def _postings(self, term_id: int, avg_len: float) -> tuple[np.ndarray, np.ndarray]:
+        if term_id + 1 < len(self._indptr):
+            start, end = self._indptr[term_id], self._indptr[term_id + 1]
+            slots, weights = self._slots[start:end], self._weights[start:end]
+        else:
+            slots, weights = self._slots[:0], self._weights[:0]
+
+        delta = self._delta.get(term_id)
+        if delta:
+            delta_slots = np.asarray(delta[0], dtype=np.int32)
+            delta_weights = self._weigh(
+                np.asarray(delta[1], dtype=np.float32),
+                self._doc_len[delta_slots],
+                avg_len,
+            )
+            slots = np.concatenate((slots, delta_slots))
+            weights = np.concatenate((weights, delta_weights))
+        return slots, weights
+
+    def search(self, query: str, limit: int = 10) -> list[SearchHit]:
+        n_docs = len(self._doc_slot)
+        term_ids = {self._vocab[t] for t in tokenize(query) if t in self._vocab}
+        if not n_docs or not term_ids:
+            return []
+
+        avg_len = self._avg_len or self._total_len / n_docs
+        all_slots, all_scores = [], []
+        for term_id in term_ids:
+            df = self._df[term_id]
+            if df <= 0:
+                continue
+            slots, weights = self._postings(term_id, avg_len)
+            idf = math.log(1 + (n_docs - df + 0.5) / (df + 0.5))
+            all_slots.append(slots)
+            all_scores.append(weights * idf)
+        if not all_slots:
+            return []
+
+        slots = np.concatenate(all_slots)
+        scores = np.concatenate(all_scores)
+        if self._dead:
+            # postings of tombstoned documents linger until the next compaction
+            alive = self._alive[slots]
+            slots, scores = slots[alive], scores[alive]
+
+        if len(all_slots) > 1:
+            # sum the per term scores, densely once the postings cover much of the index
+            if len(slots) * DENSE_RATIO > len(self._docs):
+                scores = np.bincount(slots, weights=scores, minlength=len(self._docs))
+                slots = np.flatnonzero(scores)
+                scores = scores[slots]
+            else:
+                slots, inverse = np.unique(slots, return_inverse=True)
+                scores = np.bincount(inverse, weights=scores)
+
+        if len(slots) > limit:
+            top = np.argpartition(scores, -limit)[-limit:]
+            slots, scores = slots[top], scores[top]
+        order = np.argsort(-scores, kind="stable")
+
+        hits = []
+        for slot, score in zip(slots[order].tolist(), scores[order].tolist()):
+            doc = self._docs[slot]
+            hits.append(
+                SearchHit(
+                    id=doc.id,
+                    slug=doc.slug,
+                    title=doc.title,
+                    short_desc=doc.short_desc,
+                    score=score,
+                )
+            )
+        return hits
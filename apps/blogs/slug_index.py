@@ -0,0 +1,213 @@
+"""
+Published blog slugs in a memory-mapped file, so `GET /blogs/{slug}` can answer
+unknown slugs with a 404 without a database session.
+
+The file holds a Bloom filter, which rejects almost every unknown slug after
+a few bit probes, and the sorted slugs for an exact binary search of the rest.
+It is immutable and named after a digest of its slugs: workers with the same
+published set map the same file and share its pages through the page cache.
+Writes after the load go to a small in-process overlay of added and removed
+slugs, folded into a new file once it grows.
+
+Layout, little endian: header, Bloom bits, `count + 1` uint32 offsets into the
+blob of the concatenated utf-8 slugs. Files are written atomically and an
+existing one is only reused when its magic, version, size and slug count check
+out, anything else is rewritten.
+"""
+
+import hashlib
+import logging
+import math
+import mmap
+import os
+import struct
+import time
+from collections.abc import Iterable
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b"SLUGIDX\0"
+VERSION = 2
+# magic, version, hash count, bloom bits, slug count, blob size
+HEADER = struct.Struct("<8sIIQQQ")
+OFFSET = struct.Struct("<I")
+
+FALSE_POSITIVE_RATE = 0.01
+# overlay entries folded into a new file past this share of the slugs
+COMPACT_RATIO = 0.1
+COMPACT_MIN = 256
+# older files are left behind by previous deploys, ones in use are kept mapped
+STALE_FILE_SECONDS = 24 * 60 * 60
+
+
+def _hashes(slug: bytes, k: int, m: int) -> list[int]:
+    digest = hashlib.blake2b(slug, digest_size=16).digest()
+    h1, h2 = struct.unpack("<QQ", digest)
+    return [(h1 + i * h2) % m for i in range(k)]
+
+
+class SlugSnapshot:
+    def __init__(self, path: Path) -> None:
+        with open(path, "rb") as f:
+            if os.fstat(f.fileno()).st_size < HEADER.size:
+                raise ValueError(f"{path} is truncated")
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            self._validate(path)
+        except ValueError:
+            self._map.close()
+            raise
+
+    def _validate(self, path: Path) -> None:
+        magic, version, self.k, self.m, self.count, self.blob_size = (
+            HEADER.unpack_from(self._map)
+        )
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path} is not a version {VERSION} slug index")
+        if self.k < 1 or self.m < 1:
+            raise ValueError(f"{path} has an invalid Bloom filter")
+        self._bloom = HEADER.size
+        self._offsets = self._bloom + (self.m + 7) // 8
+        self._blob = self._offsets + (self.count + 1) * OFFSET.size
+        if len(self._map) != self._blob + self.blob_size:
+            raise ValueError(f"{path} is truncated or has trailing bytes")
+        last = OFFSET.unpack_from(self._map, self._offsets + self.count * OFFSET.size)[0]
+        if last != self.blob_size:
+            raise ValueError(f"{path} has inconsistent offsets")
+
+    @staticmethod
+    def write(path: Path, slugs: list[bytes]) -> None:
+        """Writes the sorted, unique `slugs` to `path` atomically"""
+        n = max(len(slugs), 1)
+        m = max(64, math.ceil(-n * math.log(FALSE_POSITIVE_RATE) / math.log(2) ** 2))
+        k = max(1, round(m / n * math.log(2)))
+
+        bloom = bytearray((m + 7) // 8)
+        for slug in slugs:
+            for bit in _hashes(slug, k, m):
+                bloom[bit >> 3] |= 1 << (bit & 7)
+
+        offsets = [0]
+        for slug in slugs:
+            offsets.append(offsets[-1] + len(slug))
+
+        temporary = path.with_suffix(f".{os.getpid()}.tmp")
+        with open(temporary, "wb") as f:
+            f.write(HEADER.pack(MAGIC, VERSION, k, m, len(slugs), offsets[-1]))
+            f.write(bloom)
+            f.write(struct.pack(f"<{len(offsets)}I", *offsets))
+            f.write(b"".join(slugs))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temporary, path)
+
+    def _slug(self, index: int) -> bytes:
+        start, end = struct.unpack_from("<II", self._map, self._offsets + index * 4)
+        return self._map[self._blob + start : self._blob + end]
+
+    def __contains__(self, slug: bytes) -> bool:
+        for bit in _hashes(slug, self.k, self.m):
+            if not self._map[self._bloom + (bit >> 3)] & (1 << (bit & 7)):
+                return False
+        low, high = 0, self.count
+        while low < high:
+            middle = (low + high) // 2
+            if self._slug(middle) < slug:
+                low = middle + 1
+            else:
+                high = middle
+        return low < self.count and self._slug(low) == slug
+
+    def __iter__(self):
+        return (self._slug(index) for index in range(self.count))
+
+    def close(self) -> None:
+        self._map.close()
+
+
+class SlugIndex:
+    def __init__(self, directory: Path) -> None:
+        self.directory = directory
+        self._snapshot: SlugSnapshot | None = None
+        self._added: set[bytes] = set()
+        self._removed: set[bytes] = set()
+
+    @property
+    def loaded(self) -> bool:
+        return self._snapshot is not None
+
+    def __contains__(self, slug: str) -> bool:
+        if self._snapshot is None:
+            return False
+        encoded = slug.encode()
+        if encoded in self._added:
+            return True
+        if encoded in self._removed:
+            return False
+        return encoded in self._snapshot
+
+    def rebuild(self, slugs: Iterable[str]) -> None:
+        self._load(sorted({slug.encode() for slug in slugs}))
+
+    def add(self, slug: str) -> None:
+        encoded = slug.encode()
+        self._removed.discard(encoded)
+        if self._snapshot is None or encoded not in self._snapshot:
+            self._added.add(encoded)
+        self._maybe_compact()
+
+    def remove(self, slug: str) -> None:
+        encoded = slug.encode()
+        self._added.discard(encoded)
+        if self._snapshot is not None and encoded in self._snapshot:
+            self._removed.add(encoded)
+        self._maybe_compact()
+
+    def _maybe_compact(self) -> None:
+        count = self._snapshot.count if self._snapshot is not None else 0
+        overlay = len(self._added) + len(self._removed)
+        if overlay > max(COMPACT_MIN, int(count * COMPACT_RATIO)):
+            slugs = set(self._snapshot or ()) - self._removed | self._added
+            self._load(sorted(slugs))
+
+    def _load(self, slugs: list[bytes]) -> None:
+        digest = hashlib.blake2b(b"\0".join(slugs), digest_size=16).hexdigest()
+        path = self.directory / f"slugs-{digest}.idx"
+        snapshot = self._open(path, slugs)
+        if snapshot is None:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            SlugSnapshot.write(path, slugs)
+            self._remove_stale_files(path)
+            snapshot = SlugSnapshot(path)
+
+        previous = self._snapshot
+        self._snapshot = snapshot
+        self._added, self._removed = set(), set()
+        if previous is not None:
+            previous.close()
+
+    @staticmethod
+    def _open(path: Path, slugs: list[bytes]) -> SlugSnapshot | None:
+        """The existing file of `slugs` at `path`, `None` when missing or not valid"""
+        try:
+            snapshot = SlugSnapshot(path)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning("Rewriting the slug index %s: %s", path, e)
+            return None
+        if snapshot.count != len(slugs) or snapshot.blob_size != sum(map(len, slugs)):
+            logger.warning("Rewriting the slug index %s: other slugs", path)
+            snapshot.close()
+            return None
+        return snapshot
+
+    def _remove_stale_files(self, current: Path) -> None:
+        expired = time.time() - STALE_FILE_SECONDS
+        for path in self.directory.glob("slugs-*.idx"):
+            try:
+                if path != current and path.stat().st_mtime < expired:
+                    path.unlink()
+            except FileNotFoundError:
+                pass
@@ -0,0 +1,141 @@
+"""
+"Did you mean" corrections over the vocabulary of the published blogs and
+category names, using symmetric delete spelling correction (SymSpell).
+
+Every dictionary word is stored under all the strings its prefix turns into with
+up to `max_distance` deletions; a misspelling only has to generate its own deletes
+to find the candidates, which are then verified with a bounded edit distance.
+"""
+
+import re
+from collections.abc import Hashable, Iterable
+from .search_engine import STOP_WORDS, tokenize
+
+WORD_REGEX = re.compile(r"[^\W\d_]+")
+
+MIN_WORD_LENGTH = 3
+
+
+def edit_distance(a: str, b: str, max_distance: int) -> int:
+    """
+    Optimal string alignment distance (transpositions count as one edit),
+    anything above `max_distance` is reported as `max_distance + 1`.
+    """
+    if abs(len(a) - len(b)) > max_distance:
+        return max_distance + 1
+
+    previous_previous: list[int] = []
+    previous = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        current = [i] + [0] * len(b)
+        for j in range(1, len(b) + 1):
+            cost = 0 if a[i - 1] == b[j - 1] else 1
+            current[j] = min(
+                previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost
+            )
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                current[j] = min(current[j], previous_previous[j - 2] + 1)
+        if min(current) > max_distance:
+            return max_distance + 1
+        previous_previous, previous = previous, current
+    return min(previous[-1], max_distance + 1)
+
+
+class SpellingIndex:
+    def __init__(self, max_distance: int = 2, prefix_length: int = 7) -> None:
+        self.max_distance = max_distance
+        self.prefix_length = prefix_length
+        self._reset()
+
+    def _reset(self) -> None:
+        # word -> number of documents using it
+        self._words: dict[str, int] = {}
+        self._deletes: dict[str, set[str]] = {}
+        self._documents: dict[Hashable, frozenset[str]] = {}
+
+    def _edits(self, word: str) -> set[str]:
+        edits = {word[: self.prefix_length]}
+        frontier = set(edits)
+        for _ in range(self.max_distance):
+            frontier = {
+                edit[:i] + edit[i + 1 :]
+                for edit in frontier
+                if len(edit) > 1
+                for i in range(len(edit))
+            }
+            edits |= frontier
+        return edits
+
+    @staticmethod
+    def _vocabulary(text: str) -> frozenset[str]:
+        return frozenset(
+            word
+            for word in tokenize(text)
+            if len(word) >= MIN_WORD_LENGTH and word.isalpha()
+        )
+
+    def rebuild(self, documents: Iterable[tuple[Hashable, str]]) -> None:
+        self._reset()
+        for key, text in documents:
+            self.add(key, text)
+
+    def add(self, key: Hashable, text: str) -> None:
+        """Adds the words of `text`, replacing the previous text of `key`"""
+        self.remove(key)
+        words = self._vocabulary(text)
+        self._documents[key] = words
+        for word in words:
+            count = self._words.get(word, 0)
+            self._words[word] = count + 1
+            if not count:
+                for edit in self._edits(word):
+                    self._deletes.setdefault(edit, set()).add(word)
+
+    def remove(self, key: Hashable) -> None:
+        for word in self._documents.pop(key, ()):
+            count = self._words[word] - 1
+            if count:
+                self._words[word] = count
+                continue
+            del self._words[word]
+            for edit in self._edits(word):
+                candidates = self._deletes[edit]
+                candidates.discard(word)
+                if not candidates:
+                    del self._deletes[edit]
+
+    def lookup(self, word: str) -> str | None:
+        """The closest, then most used, dictionary word to `word`"""
+        word = word.lower()
+        if word in self._words:
+            return word
+
+        best, best_rank = None, None
+        for edit in self._edits(word):
+            for candidate in self._deletes.get(edit, ()):
+                distance = edit_distance(word, candidate, self.max_distance)
+                if distance > self.max_distance:
+                    continue
+                rank = (distance, -self._words[candidate], candidate)
+                if best_rank is None or rank < best_rank:
+                    best, best_rank = candidate, rank
+        return best
+
+    def correct(self, query: str) -> str | None:
+        """`query` with its unknown words corrected, `None` when nothing changed"""
+        changed = False
+
+        def replace(match: re.Match) -> str:
+            nonlocal changed
+            word = match.group(0)
+            lowered = word.lower()
+            if len(lowered) < MIN_WORD_LENGTH or lowered in STOP_WORDS:
+                return word
+            correction = self.lookup(lowered)
+            if correction is None or correction == lowered:
+                return word
+            changed = True
+            return correction
+
+        corrected = WORD_REGEX.sub(replace, query)
+        return corrected if changed else None
@@ -0,0 +1,124 @@
+"""
+Typeahead over the published blog titles and category names.
+
+Every word start of a text is a key ("brain health tips" is also reachable as
+"health tips" and "tips"). The keys of whole texts and of later words are kept in
+two sorted lists, a prefix lookup is a `bisect` to the first candidate of each
+followed by a short scan, writes are `insort`s and exact removals.
+"""
+
+import re
+from bisect import bisect_left, insort
+from dataclasses import dataclass
+
+WORD_REGEX = re.compile(r"\w+")
+
+# keys are cut to this length, longer prefixes than that are never typed
+MAX_KEY_LENGTH = 48
+MAX_KEYS_PER_TEXT = 12
+# keys scanned per requested suggestion before giving up on better ones
+SCAN_FACTOR = 8
+
+
+def normalize(text: str) -> str:
+    return " ".join(WORD_REGEX.findall(text.lower()))
+
+
+@dataclass(slots=True)
+class Suggestion:
+    type: str
+    id: int
+    slug: str
+    text: str
+
+
+class PrefixIndex:
+    def __init__(self) -> None:
+        # (key, word position, type, id), sorted. One key per text in `_starts`,
+        # scanned first so later word matches never crowd out whole text ones
+        self._starts: list[tuple[str, int, str, int]] = []
+        self._words: list[tuple[str, int, str, int]] = []
+        self._items: dict[tuple[str, int], tuple[Suggestion, list[tuple]]] = {}
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    @staticmethod
+    def _keys_for(suggestion: Suggestion) -> list[tuple[str, int, str, int]]:
+        words = normalize(suggestion.text).split(" ")
+        return [
+            (" ".join(words[position:])[:MAX_KEY_LENGTH], position, *_ref(suggestion))
+            for position in range(min(len(words), MAX_KEYS_PER_TEXT))
+            if words[position]
+        ]
+
+    def _list_for(self, key: tuple[str, int, str, int]) -> list:
+        return self._starts if key[1] == 0 else self._words
+
+    def rebuild(self, suggestions: list[Suggestion]) -> None:
+        self._items = {}
+        starts, words = [], []
+        for suggestion in suggestions:
+            item_keys = self._keys_for(suggestion)
+            self._items[_ref(suggestion)] = (suggestion, item_keys)
+            for key in item_keys:
+                (starts if key[1] == 0 else words).append(key)
+        starts.sort()
+        words.sort()
+        self._starts, self._words = starts, words
+
+    def add(self, suggestion: Suggestion) -> None:
+        """Indexes `suggestion`, replacing any previous version of the same item"""
+        self.remove(suggestion.type, suggestion.id)
+        item_keys = self._keys_for(suggestion)
+        self._items[_ref(suggestion)] = (suggestion, item_keys)
+        for key in item_keys:
+            insort(self._list_for(key), key)
+
+    def remove(self, type: str, id: int) -> None:
+        item = self._items.pop((type, id), None)
+        if item is None:
+            return
+        for key in item[1]:
+            keys = self._list_for(key)
+            index = bisect_left(keys, key)
+            if index < len(keys) and keys[index] == key:
+                del keys[index]
+
+    def suggest(self, query: str, limit: int = 8) -> list[Suggestion]:
+        prefix = normalize(query)[:MAX_KEY_LENGTH]
+        if not prefix:
+            return []
+
+        matches: dict[tuple[str, int], tuple[int, int]] = {}
+        self._scan(self._starts, prefix, limit, matches)
+        # later words only for the places whole texts did not fill
+        if len(matches) < limit:
+            self._scan(self._words, prefix, limit, matches)
+
+        # texts starting with the prefix first, then shorter ones
+        refs = sorted(matches, key=matches.__getitem__)[:limit]
+        return [self._items[ref][0] for ref in refs]
+
+    def _scan(
+        self,
+        keys: list[tuple[str, int, str, int]],
+        prefix: str,
+        limit: int,
+        matches: dict[tuple[str, int], tuple[int, int]],
+    ) -> None:
+        index = bisect_left(keys, (prefix,))
+        end = min(len(keys), index + limit * SCAN_FACTOR)
+        while index < end:
+            key, position, type, id = keys[index]
+            if not key.startswith(prefix):
+                break
+            ref = (type, id)
+            rank = (position, len(self._items[ref][0].text))
+            if ref not in matches or rank < matches[ref]:
+                matches[ref] = rank
+            index += 1
+
+
+def _ref(suggestion: Suggestion) -> tuple[str, int]:
+    return suggestion.type, suggestion.id
@@ -0,0 +1,100 @@
+"""
+Surrogate keys tagging the public blog and category responses at the CDN, and
+the purges that follow every committed write to blogs, categories or images.
+
+Details carry the keys of the rows they embed (`blog:42 category:7 image:3`),
+lists a key per kind of list. Rows unknown to a write (bulk statements) purge
+every response of their kind through `blogs` / `categories`.
+
+The edge refetches purged pages right away, possibly from another worker's
+microcache that hasn't heard of the write yet, so every purge is repeated once
+the microcache entries from before it have expired.
+"""
+
+import asyncio
+from core import get_config
+from core.cache import clear_microcache
+from core.cdn import get_cdn
+from core.invalidation import on_invalidate
+
+BLOGS = "blogs"
+CATEGORIES = "categories"
+BLOG_LIST = "blog-list"
+CATEGORY_LIST = "category-list"
+# recomputed in the background, purged once the new neighbours are stored
+BLOG_RELATED = "blog-related"
+
+
+def blog_key(id: int) -> str:
+    return f"blog:{id}"
+
+
+def category_key(id: int) -> str:
+    return f"category:{id}"
+
+
+def image_key(id: int) -> str:
+    return f"image:{id}"
+
+
+def blog_keys(id: int, category_id: int | None, thumbnail_id: int | None) -> list[str]:
+    keys = [BLOGS, blog_key(id)]
+    if category_id is not None:
+        keys.append(category_key(category_id))
+    if thumbnail_id is not None:
+        keys.append(image_key(thumbnail_id))
+    return keys
+
+
+def category_keys(id: int, thumbnail_id: int | None) -> list[str]:
+    keys = [CATEGORIES, category_key(id)]
+    if thumbnail_id is not None:
+        keys.append(image_key(thumbnail_id))
+    return keys
+
+
+# running delayed purges, the loop only keeps weak references to tasks
+_repurging: set[asyncio.Task] = set()
+
+
+async def _purge(*keys: str) -> None:
+    # the microcache first, the edge must not refetch the copy it holds
+    await clear_microcache()
+    await get_cdn().purge(*keys)
+    task = asyncio.get_running_loop().create_task(_purge_later(keys))
+    _repurging.add(task)
+    task.add_done_callback(_repurging.discard)
+
+
+async def _purge_later(keys: tuple[str, ...]) -> None:
+    config = get_config()
+    await asyncio.sleep(config.microcache_ttl + config.microcache_stale_ttl)
+    await get_cdn().purge(*keys)
+
+
+# purged by the writing worker only, the edge is shared by all of them
+
+
+@on_invalidate("blog", remote=False)
+async def _purge_blogs(ids: list[int] | None) -> None:
+    if ids is None:
+        await _purge(BLOGS)
+        return
+    await _purge(BLOG_LIST, *map(blog_key, ids))
+
+
+@on_invalidate("blog_category", remote=False)
+async def _purge_categories(ids: list[int] | None) -> None:
+    # lists and blog pages embed the category name
+    if ids is None:
+        await _purge(CATEGORIES, BLOGS)
+        return
+    await _purge(BLOG_LIST, CATEGORY_LIST, *map(category_key, ids))
+
+
+@on_invalidate("image", remote=False)
+async def _purge_images(ids: list[int] | None) -> None:
+    if ids is None:
+        await _purge(BLOGS, CATEGORIES)
+        return
+    await _purge(BLOG_LIST, CATEGORY_LIST, *map(image_key, ids))
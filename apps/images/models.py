@@ -1,7 +1,7 @@
 from typing import TYPE_CHECKING
 from core.base_model import BaseModel
 from datetime import datetime
-from sqlalchemy import DateTime, String, func, ForeignKey
+from sqlalchemy import DateTime, Index, String, func, ForeignKey
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 if TYPE_CHECKING:
@@ -26,3 +26,12 @@ class Image(BaseModel):
         "User",
         back_populates="images",
     )
+
+    __table_args__ = (
+        Index(
+            "ix_image_title_trgm",
+            "title",
+            postgresql_using="gin",
+            postgresql_ops={"title": "gin_trgm_ops"},
+        ),
+    )
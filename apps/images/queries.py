@@ -0,0 +1,31 @@
+from typing import Any
+from sqlalchemy import Row, Select, select
+from apps.auth.models import User
+from .models import Image
+
+# Column projection for the public image list, no ORM hydration of images,
+# uploaders or their profiles.
+
+
+def image_list_query() -> Select:
+    return select(
+        Image.id,
+        Image.url,
+        Image.alt_text,
+        Image.title,
+        Image.user_id,
+        Image.created_at,
+        User.name.label("uploaded_by_name"),
+    ).join(User, Image.user_id == User.id)
+
+
+def image_row_to_dict(row: Row) -> dict[str, Any]:
+    return {
+        "id": row.id,
+        "url": row.url,
+        "alt_text": row.alt_text,
+        "title": row.title,
+        "user_id": row.user_id,
+        "created_at": row.created_at,
+        "uploaded_by": {"id": row.user_id, "name": row.uploaded_by_name},
+    }
@@ -1,12 +1,13 @@
 # In apps/images/routes.py
 
 from typing import Annotated
-from sqlalchemy import func, select
+from sqlalchemy import insert, select
 from fastapi import APIRouter, Query, Form, HTTPException
-from core.db import SessionDependency
+from core.db import ReadSessionDependency, SessionDependency
 from core.exceptions.common import FieldValidationError
+from core.pagination import paginate
 from .models import Image
-from apps.auth.models import User
+from .queries import image_list_query, image_row_to_dict
 from .dtos import (
     ImageListQuery,
     ImageListResponse,
@@ -30,26 +31,16 @@ image_upload_options = UploadFileOptions(
 @image_router.get("/", response_model=ImageListResponse)
 async def get_images(
     qs: Annotated[ImageListQuery, Query()],
-    session: SessionDependency,
+    session: ReadSessionDependency,
     image_policy: image_policy_dep,
 ):
     await image_policy.authorize_get_images()
-    base_query = select(Image).options(
-        selectinload(Image.uploaded_by).selectinload(User.profile)
-    )
+    base_query = image_list_query()
     if qs.search:
         base_query = base_query.where(Image.title.ilike(f"%{qs.search}%"))
-    count_query = select(func.count()).select_from(base_query.subquery())
-    total = await session.scalar(count_query)
-    paginated_query = base_query.limit(qs.per_page).offset((qs.page - 1) * qs.per_page)
-    results = await session.scalars(paginated_query)
-    images = results.all()
-    response = {
-        "data": images,
-        "page": qs.page,
-        "per_page": qs.per_page,
-        "total": total,
-    }
+    response = await paginate(session, qs, base_query)
+    await session.release()
+    response.data = [image_row_to_dict(row) for row in response.data]
     return response
 
 
@@ -69,14 +60,13 @@ async def create_image(
             raise FieldValidationError("body", "file", e.detail)
         else:
             raise e
-    image = Image(
-        **form_data.model_dump(exclude={"file"}),
-        user_id=auth_user.id,
-        url=url
+    image = await session.scalar(
+        insert(Image)
+        .values(**form_data.model_dump(exclude={"file"}), user_id=auth_user.id, url=url)
+        .returning(Image)
+        .options(selectinload(Image.uploaded_by))
     )
-    session.add(image)
     await session.commit()
-    await session.refresh(image, ["uploaded_by"])
     return image
 
 
@@ -1,3 +1,12 @@
 from .auth.models import User, Profile, user_role_link, Role, Otp  # noqa
-from .blogs.models import Blog, BlogCategory  # noqa
+from .blogs.models import Blog, BlogCategory, BlogTerm, RelatedBlog  # noqa
 from .images.models import Image  # noqa
+
+from core.invalidation import watch_model
+
+# changes to these are published to every worker
+watch_model(Blog, "blog")
+watch_model(BlogCategory, "blog_category")
+watch_model(Image, "image")
+watch_model(User, "user")
+watch_model(Role, "role")
@@ -0,0 +1,222 @@
+"""
+Per request CPU cost of the public blog, category and image list pages: ORM
+entities with their relationships `selectinload`ed and validated from
+attributes, as the routes did before, against the column projections of
+`apps/blogs/queries.py` and `apps/images/queries.py` mapped by their
+`*_row_to_dict` functions.
+
+Both read the same rows from an in-memory SQLite database, so the timings are
+dominated by row processing, hydration and validation rather than by the
+database. Postgres adds the same query time to both sides, plus the transfer
+of the `content` column the projections never select.
+
+    python -m benchmarks.list_projections [rows per page] [repeats]
+"""
+
+import statistics
+import sys
+import time
+from collections.abc import Callable
+from datetime import datetime, timedelta
+from sqlalchemy import create_engine, event, insert, select
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.orm import Session, selectinload
+import apps.load_model  # noqa
+from apps.auth.models import Profile, User
+from apps.blogs.dtos import BlogCategoryReadList, BlogRead
+from apps.blogs.models import Blog, BlogCategory
+from apps.blogs.queries import (
+    blog_category_list_query,
+    blog_category_row_to_dict,
+    blog_list_query,
+    blog_row_to_dict,
+)
+from apps.images.dtos import ImageRead
+from apps.images.models import Image
+from apps.images.queries import image_list_query, image_row_to_dict
+from core.base_model import BaseModel
+
+TABLES = ["user", "profile", "image", "blog_category", "blog"]
+CONTENT = "<p>" + "Lorem ipsum dolor sit amet, consectetur adipiscing elit. " * 40 + "</p>"
+
+
+# the generated search vector column of `blog`, only ever read by postgres
+@compiles(TSVECTOR, "sqlite")
+def _tsvector(type_, compiler, **kw):
+    return "TEXT"
+
+
+def _register_functions(connection, record) -> None:
+    connection.create_function(
+        "to_tsvector", 2, lambda config, text: text or "", deterministic=True
+    )
+    connection.create_function(
+        "setweight", 2, lambda vector, weight: vector, deterministic=True
+    )
+
+
+def create_database(rows: int):
+    engine = create_engine("sqlite://")
+    event.listen(engine, "connect", _register_functions)
+    tables = [BaseModel.metadata.tables[name] for name in TABLES]
+    BaseModel.metadata.create_all(engine, tables=tables)
+
+    created_at = datetime(2025, 1, 1)
+    with engine.begin() as connection:
+        connection.execute(
+            insert(User),
+            [
+                dict(
+                    id=id,
+                    name=f"user {id}",
+                    username=f"user{id}",
+                    email=f"user{id}@example.com",
+                    password="x",
+                )
+                for id in range(1, 11)
+            ],
+        )
+        connection.execute(insert(Profile), [dict(user_id=id) for id in range(1, 11)])
+        connection.execute(
+            insert(Image),
+            [
+                dict(
+                    id=id,
+                    url=f"/uploads/{id}.png",
+                    alt_text=f"image {id}",
+                    title=f"Image {id}",
+                    user_id=id % 10 + 1,
+                    created_at=created_at + timedelta(minutes=id),
+                )
+                for id in range(1, rows + 1)
+            ],
+        )
+        connection.execute(
+            insert(BlogCategory),
+            [
+                dict(
+                    id=id,
+                    slug=f"category-{id}",
+                    name=f"Category {id}",
+                    is_published=True,
+                    thumbnail_id=id,
+                    created_at=created_at + timedelta(minutes=id),
+                )
+                for id in range(1, rows + 1)
+            ],
+        )
+        connection.execute(
+            insert(Blog),
+            [
+                dict(
+                    id=id,
+                    slug=f"post-{id}",
+                    title=f"Post {id}",
+                    is_published=True,
+                    short_desc=f"About post {id}",
+                    content=CONTENT,
+                    category_id=id % 20 + 1,
+                    thumbnail_id=id if id % 2 else None,
+                    created_at=created_at + timedelta(minutes=id),
+                    updated_at=created_at + timedelta(minutes=id),
+                )
+                for id in range(1, rows + 1)
+            ],
+        )
+    return engine
+
+
+def orm_blogs(session: Session, rows: int) -> list:
+    blogs = session.scalars(
+        select(Blog)
+        .options(selectinload(Blog.category), selectinload(Blog.thumbnail))
+        .order_by(Blog.created_at.desc(), Blog.id.desc())
+        .limit(rows)
+    ).all()
+    return [BlogRead.model_validate(blog, from_attributes=True) for blog in blogs]
+
+
+def projected_blogs(session: Session, rows: int) -> list:
+    result = session.execute(
+        blog_list_query().order_by(Blog.created_at.desc(), Blog.id.desc()).limit(rows)
+    )
+    return [BlogRead.model_validate(blog_row_to_dict(row)) for row in result]
+
+
+def orm_categories(session: Session, rows: int) -> list:
+    categories = session.scalars(
+        select(BlogCategory)
+        .options(selectinload(BlogCategory.thumbnail))
+        .order_by(BlogCategory.created_at.desc(), BlogCategory.id.desc())
+        .limit(rows)
+    ).all()
+    return [
+        BlogCategoryReadList.model_validate(category, from_attributes=True)
+        for category in categories
+    ]
+
+
+def projected_categories(session: Session, rows: int) -> list:
+    result = session.execute(
+        blog_category_list_query()
+        .order_by(BlogCategory.created_at.desc(), BlogCategory.id.desc())
+        .limit(rows)
+    )
+    return [
+        BlogCategoryReadList.model_validate(blog_category_row_to_dict(row))
+        for row in result
+    ]
+
+
+def orm_images(session: Session, rows: int) -> list:
+    images = session.scalars(
+        select(Image)
+        .options(selectinload(Image.uploaded_by).selectinload(User.profile))
+        .order_by(Image.id.desc())
+        .limit(rows)
+    ).all()
+    return [ImageRead.model_validate(image, from_attributes=True) for image in images]
+
+
+def projected_images(session: Session, rows: int) -> list:
+    result = session.execute(image_list_query().order_by(Image.id.desc()).limit(rows))
+    return [ImageRead.model_validate(image_row_to_dict(row)) for row in result]
+
+
+def measure(
+    engine, build: Callable[[Session, int], list], rows: int, repeats: int
+) -> float:
+    """Median milliseconds of one page, each in a fresh session like a request"""
+    timings = []
+    for _ in range(repeats):
+        with Session(engine) as session:
+            started = time.perf_counter()
+            build(session, rows)
+            timings.append(time.perf_counter() - started)
+    return statistics.median(timings) * 1000
+
+
+def main(rows: int = 100, repeats: int = 50) -> None:
+    engine = create_database(rows)
+    lists = [
+        ("blogs", orm_blogs, projected_blogs),
+        ("categories", orm_categories, projected_categories),
+        ("images", orm_images, projected_images),
+    ]
+    print(f"{rows} rows per page, median of {repeats} pages")
+    print(f"{'list':<12}{'orm ms':>10}{'projection ms':>16}{'saved':>10}")
+    for name, orm, projected in lists:
+        with Session(engine) as session:
+            assert orm(session, rows) == projected(session, rows)
+        # warm up the statement caches of both sides
+        measure(engine, orm, rows, 3)
+        measure(engine, projected, rows, 3)
+        orm_ms = measure(engine, orm, rows, repeats)
+        projected_ms = measure(engine, projected, rows, repeats)
+        saved = 1 - projected_ms / orm_ms
+        print(f"{name:<12}{orm_ms:>10.2f}{projected_ms:>16.2f}{saved:>10.0%}")
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:3]))
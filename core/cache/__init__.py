@@ -0,0 +1,28 @@
+from .abstracts import CacheBackend, CacheBackendError
+from .base import (
+    Cache,
+    CacheDependency,
+    CacheStats,
+    cached,
+    get_cache,
+    make_key,
+)
+from .memory import MemoryCacheBackend
+from .middleware import MicrocacheMiddleware, clear_microcache
+from .redis import RedisCacheBackend, RedisReplyError
+
+__all__ = [
+    "Cache",
+    "CacheBackend",
+    "CacheBackendError",
+    "CacheDependency",
+    "CacheStats",
+    "MemoryCacheBackend",
+    "MicrocacheMiddleware",
+    "RedisCacheBackend",
+    "RedisReplyError",
+    "cached",
+    "clear_microcache",
+    "get_cache",
+    "make_key",
+]
@@ -0,0 +1,36 @@
+from abc import ABC, abstractmethod
+
+
+class CacheBackendError(Exception):
+    """The cache backend could not be reached or rejected a command"""
+
+
+class CacheBackend(ABC):
+    # entries dropped to make room, not counting the expired ones
+    evictions: int = 0
+    # whether every worker reads the same entries
+    shared: bool = False
+
+    @abstractmethod
+    async def get(self, key: str) -> bytes | None:
+        """returns the stored value or None when the key is missing or expired"""
+        pass
+
+    @abstractmethod
+    async def set(self, key: str, value: bytes, ttl: float | None = None) -> None:
+        """stores the value, `ttl` in seconds, None keeps it until evicted"""
+        pass
+
+    @abstractmethod
+    async def delete(self, *keys: str) -> None:
+        """removes the keys, missing ones are ignored"""
+        pass
+
+    @abstractmethod
+    async def clear(self, prefix: str = "") -> None:
+        """removes every key starting with the prefix"""
+        pass
+
+    async def close(self) -> None:
+        """releases the connections held by the backend"""
+        pass
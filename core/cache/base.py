@@ -0,0 +1,223 @@
+import functools
+import hashlib
+import inspect
+import json
+import logging
+import pickle
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, replace
+from datetime import date
+from enum import Enum
+from functools import lru_cache
+from typing import Annotated, Any, ParamSpec, TypeVar
+from fastapi import Depends
+from pydantic import BaseModel
+from core.config import CacheBackendType, get_config
+from .abstracts import CacheBackend, CacheBackendError
+from .memory import MemoryCacheBackend
+from .redis import RedisCacheBackend
+
+logger = logging.getLogger(__name__)
+
+P = ParamSpec("P")
+T = TypeVar("T")
+
+# longer keys keep a readable head and a digest of the whole key
+MAX_KEY_LENGTH = 200
+
+_MISSING = object()
+
+_PLAIN_TYPES = (str, int, float, bool, type(None), Enum, date, BaseModel)
+
+
+def key_part(value: Any) -> str:
+    """Stable text of a key component, pydantic models by their json dump"""
+    if isinstance(value, Enum):
+        value = value.value
+    if isinstance(value, BaseModel):
+        return value.model_dump_json()
+    if isinstance(value, date):
+        return value.isoformat()
+    if isinstance(value, (list, tuple, set, frozenset, dict)):
+        if isinstance(value, (set, frozenset)):
+            value = sorted(value, key=str)
+        return json.dumps(value, sort_keys=True, separators=(",", ":"), default=str)
+    return str(value)
+
+
+def make_key(*parts: Any) -> str:
+    key = ":".join(key_part(part) for part in parts)
+    if len(key) > MAX_KEY_LENGTH:
+        digest = hashlib.blake2b(key.encode(), digest_size=16).hexdigest()
+        key = f"{key[: MAX_KEY_LENGTH - len(digest) - 1]}#{digest}"
+    return key
+
+
+def call_key(signature: inspect.Signature, *args: Any, **kwargs: Any) -> str:
+    """
+    Key of a call from its plain arguments (`str`, numbers, enums, dates and
+    pydantic models such as query DTOs). Sessions, `Auth` and other injected
+    dependencies are left out, handlers whose result depends on them must pass
+    their own `key` to `cached`.
+    """
+    bound = signature.bind(*args, **kwargs)
+    bound.apply_defaults()
+    return make_key(
+        *(
+            f"{name}={key_part(value)}"
+            for name, value in bound.arguments.items()
+            if isinstance(value, _PLAIN_TYPES)
+        )
+    )
+
+
+@dataclass(slots=True)
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    errors: int = 0
+    evictions: int = 0
+
+    @property
+    def hit_ratio(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+class Cache:
+    """
+    Values are pickled, so anything from a dict to a pydantic model can be stored.
+    A failing backend is logged and counted in `errors` and treated as a miss,
+    requests keep being served from the database.
+    """
+
+    def __init__(
+        self,
+        backend: CacheBackend,
+        prefix: str = "cache",
+        default_ttl: float | None = 60,
+        stats: CacheStats | None = None,
+    ) -> None:
+        self.backend = backend
+        self.prefix = prefix
+        self.default_ttl = default_ttl
+        self._stats = stats if stats is not None else CacheStats()
+
+    @property
+    def stats(self) -> CacheStats:
+        return replace(self._stats, evictions=self.backend.evictions)
+
+    def namespace(self, name: str) -> "Cache":
+        """A view whose keys, and `clear`, are scoped under `name`"""
+        return Cache(
+            self.backend, f"{self.prefix}:{name}", self.default_ttl, stats=self._stats
+        )
+
+    def key(self, *parts: Any) -> str:
+        return f"{self.prefix}:{make_key(*parts)}"
+
+    async def get(self, key: str, default: Any = None) -> Any:
+        try:
+            value = await self.backend.get(self.key(key))
+        except CacheBackendError as e:
+            logger.warning("Cache get of %s failed: %s", key, e)
+            self._stats.errors += 1
+            value = None
+
+        if value is None:
+            self._stats.misses += 1
+            return default
+        self._stats.hits += 1
+        return pickle.loads(value)
+
+    async def set(self, key: str, value: Any, ttl: float | None = None) -> None:
+        data = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        try:
+            await self.backend.set(self.key(key), data, ttl or self.default_ttl)
+        except CacheBackendError as e:
+            logger.warning("Cache set of %s failed: %s", key, e)
+            self._stats.errors += 1
+
+    async def delete(self, *keys: str) -> None:
+        try:
+            await self.backend.delete(*(self.key(key) for key in keys))
+        except CacheBackendError as e:
+            logger.warning("Cache delete of %s failed: %s", keys, e)
+            self._stats.errors += 1
+
+    async def clear(self) -> None:
+        """Removes every key of this namespace"""
+        try:
+            await self.backend.clear(f"{self.prefix}:")
+        except CacheBackendError as e:
+            logger.warning("Cache clear of %s failed: %s", self.prefix, e)
+            self._stats.errors += 1
+
+    async def get_or_set(
+        self,
+        key: str,
+        factory: Callable[[], Awaitable[T]],
+        ttl: float | None = None,
+    ) -> T:
+        value = await self.get(key, _MISSING)
+        if value is _MISSING:
+            value = await factory()
+            await self.set(key, value, ttl)
+        return value
+
+    async def close(self) -> None:
+        await self.backend.close()
+
+
+def cached(
+    namespace: str,
+    ttl: float | None = None,
+    key: Callable[..., Any] | None = None,
+) -> Callable[[Callable[P, Awaitable[T]]], Callable[P, Awaitable[T]]]:
+    """
+    Caches the result of an async service function or route handler under
+    `namespace`, keyed by the function and by `key(*args, **kwargs)` when given,
+    its plain arguments otherwise (see `call_key`). The wrapper keeps the
+    signature of the function so FastAPI still resolves the same dependencies.
+    """
+
+    def decorator(func: Callable[P, Awaitable[T]]) -> Callable[P, Awaitable[T]]:
+        signature = inspect.signature(func)
+        name = f"{func.__module__}.{func.__qualname__}"
+
+        @functools.wraps(func)
+        async def wrapper(*args: P.args, **kwargs: P.kwargs) -> T:
+            if key is not None:
+                call = make_key(key(*args, **kwargs))
+            else:
+                call = call_key(signature, *args, **kwargs)
+            return await get_cache().namespace(namespace).get_or_set(
+                make_key(name, call), lambda: func(*args, **kwargs), ttl
+            )
+
+        return wrapper
+
+    return decorator
+
+
+@lru_cache
+def get_cache() -> Cache:
+    config = get_config()
+    if config.cache_backend == CacheBackendType.MEMORY:
+        backend = MemoryCacheBackend(
+            max_entries=config.cache_max_entries, max_bytes=config.cache_max_bytes
+        )
+    elif config.cache_backend == CacheBackendType.REDIS:
+        backend = RedisCacheBackend(
+            config.cache_redis_url,
+            pool_size=config.cache_redis_pool_size,
+            timeout=config.cache_redis_timeout,
+        )
+    else:
+        raise ValueError(
+            "No cache backend configured. Did you forget to add config env variable?"
+        )
+    return Cache(backend, prefix=config.cache_key_prefix, default_ttl=config.cache_default_ttl)
+
+
+CacheDependency = Annotated[Cache, Depends(get_cache)]
@@ -0,0 +1,73 @@
+import time
+from collections import OrderedDict
+from .abstracts import CacheBackend
+
+
+class MemoryCacheBackend(CacheBackend):
+    """
+    Per worker LRU cache bounded by entry count and by the total size of the
+    stored values, least recently used entries are dropped first when either
+    limit is reached. Expired entries are removed as they are read or evicted.
+    """
+
+    def __init__(self, max_entries: int, max_bytes: int) -> None:
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        # key -> (value, expires_at)
+        self._entries: OrderedDict[str, tuple[bytes, float | None]] = OrderedDict()
+        self._size = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def size(self) -> int:
+        return self._size
+
+    def _pop(self, key: str) -> None:
+        value, _ = self._entries.pop(key)
+        self._size -= len(key) + len(value)
+
+    async def get(self, key: str) -> bytes | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        value, expires_at = entry
+        if expires_at is not None and expires_at <= time.monotonic():
+            self._pop(key)
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    async def set(self, key: str, value: bytes, ttl: float | None = None) -> None:
+        if key in self._entries:
+            self._pop(key)
+        size = len(key) + len(value)
+        if size > self.max_bytes:
+            # would flush the whole cache for a single entry
+            return
+
+        expires_at = time.monotonic() + ttl if ttl is not None else None
+        self._entries[key] = (value, expires_at)
+        self._size += size
+
+        now = time.monotonic()
+        while self._size > self.max_bytes or len(self._entries) > self.max_entries:
+            oldest, (_, oldest_expires_at) = next(iter(self._entries.items()))
+            self._pop(oldest)
+            if oldest_expires_at is None or oldest_expires_at > now:
+                self.evictions += 1
+
+    async def delete(self, *keys: str) -> None:
+        for key in keys:
+            if key in self._entries:
+                self._pop(key)
+
+    async def clear(self, prefix: str = "") -> None:
+        if not prefix:
+            self._entries.clear()
+            self._size = 0
+            return
+        for key in [key for key in self._entries if key.startswith(prefix)]:
+            self._pop(key)
@@ -0,0 +1,182 @@
+import asyncio
+import logging
+import re
+import time
+from collections.abc import Iterable
+from urllib.parse import parse_qsl, urlencode
+from starlette.requests import HTTPConnection
+from core.http_cache import etag_matches
+from .base import get_cache
+
+logger = logging.getLogger(__name__)
+
+MICROCACHE_NAMESPACE = "microcache"
+
+# the cached bytes stay valid while these headers are replayed
+SKIPPED_HEADERS = frozenset((b"date", b"content-length", b"set-cookie"))
+CONDITIONAL_HEADERS = frozenset((b"if-none-match", b"if-modified-since"))
+
+
+def normalize_query(query_string: bytes) -> str:
+    """Sorted query parameters, so `?b=1&a=2` and `?a=2&b=1` share an entry"""
+    params = parse_qsl(query_string.decode("latin-1"), keep_blank_values=True)
+    return urlencode(sorted(params))
+
+
+async def clear_microcache() -> None:
+    await get_cache().namespace(MICROCACHE_NAMESPACE).clear()
+
+
+class MicrocacheMiddleware:
+    """
+    Short lived cache of whole `GET` responses for anonymous visitors, keyed by
+    path and normalized query string. Requests carrying a bearer token or any of
+    `bypass_cookies` (admins see unpublished rows) always reach the app.
+
+    Entries are fresh for `ttl` seconds and then served stale for up to
+    `stale_ttl` more while a single background request per key and worker
+    refreshes them.
+    """
+
+    def __init__(
+        self,
+        app,
+        paths: Iterable[str],
+        ttl: float,
+        stale_ttl: float,
+        bypass_cookies: Iterable[str] = (),
+        max_body_bytes: int = 1024 * 1024,
+    ) -> None:
+        self.app = app
+        self.paths = [re.compile(path) for path in paths]
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.bypass_cookies = tuple(bypass_cookies)
+        self.max_body_bytes = max_body_bytes
+        self._refreshing: dict[str, asyncio.Task] = {}
+
+    def _cacheable(self, scope) -> bool:
+        if scope["type"] != "http" or scope["method"] != "GET":
+            return False
+        if not any(path.fullmatch(scope["path"]) for path in self.paths):
+            return False
+        connection = HTTPConnection(scope)
+        if "authorization" in connection.headers:
+            return False
+        return not any(cookie in connection.cookies for cookie in self.bypass_cookies)
+
+    async def __call__(self, scope, receive, send):
+        if not self._cacheable(scope):
+            await self.app(scope, receive, send)
+            return
+
+        cache = get_cache().namespace(MICROCACHE_NAMESPACE)
+        key = f"{scope['path']}?{normalize_query(scope['query_string'])}"
+        entry = await cache.get(key)
+        if entry is not None:
+            stored_at, status, headers, body = entry
+            age = time.time() - stored_at
+            if age < self.ttl:
+                await self._replay(scope, send, status, headers, body, b"HIT", age)
+                return
+            if age < self.ttl + self.stale_ttl:
+                self._refresh(key, self._unconditional(scope))
+                await self._replay(scope, send, status, headers, body, b"STALE", age)
+                return
+
+        response = await self._capture(scope, receive, send)
+        if response is not None:
+            await cache.set(key, response, ttl=self.ttl + self.stale_ttl)
+
+    async def _replay(
+        self, scope, send, status, headers, body, state: bytes, age: float
+    ):
+        headers = [*headers, (b"age", str(int(age)).encode()), (b"x-cache", state)]
+        etag = next((value for name, value in headers if name.lower() == b"etag"), None)
+        if_none_match = HTTPConnection(scope).headers.get("if-none-match")
+        if etag and if_none_match and etag_matches(if_none_match, etag.decode()):
+            # revalidation of the stored copy, answered without the body
+            headers = [header for header in headers if header[0].lower() != b"content-type"]
+            status, body = 304, b""
+        else:
+            headers.append((b"content-length", str(len(body)).encode()))
+        await send({"type": "http.response.start", "status": status, "headers": headers})
+        await send({"type": "http.response.body", "body": body})
+
+    async def _capture(self, scope, receive, send):
+        """
+        Runs the app, forwarding to `send` when given, and returns the entry to
+        store, `None` for responses that must not be shared.
+        """
+        start: dict = {}
+        chunks: list[bytes] = []
+        size = 0
+
+        async def send_wrapper(message):
+            nonlocal size
+            if message["type"] == "http.response.start":
+                start.update(message)
+                if send is not None:
+                    headers = [*message.get("headers", []), (b"x-cache", b"MISS")]
+                    message = {**message, "headers": headers}
+            elif message["type"] == "http.response.body":
+                size += len(message.get("body", b""))
+                if size <= self.max_body_bytes:
+                    chunks.append(message.get("body", b""))
+            if send is not None:
+                await send(message)
+
+        await self.app(scope, receive, send_wrapper)
+
+        headers = start.get("headers", [])
+        if start.get("status") != 200 or size > self.max_body_bytes:
+            return None
+        for name, value in headers:
+            if name.lower() == b"set-cookie":
+                return None
+            if name.lower() == b"cache-control" and (
+                b"no-store" in value or b"private" in value
+            ):
+                return None
+        headers = [
+            (name, value)
+            for name, value in headers
+            if name.lower() not in SKIPPED_HEADERS
+        ]
+        return time.time(), start["status"], headers, b"".join(chunks)
+
+    @staticmethod
+    def _unconditional(scope):
+        """Copy of `scope` without the client's validators, a refresh must get the full body"""
+        headers = [
+            (name, value)
+            for name, value in scope["headers"]
+            if name.lower() not in CONDITIONAL_HEADERS
+        ]
+        return {**scope, "headers": headers}
+
+    def _refresh(self, key: str, scope) -> None:
+        if key in self._refreshing:
+            return
+        task = asyncio.get_running_loop().create_task(self._run_refresh(key, scope))
+        self._refreshing[key] = task
+        task.add_done_callback(lambda _: self._refreshing.pop(key, None))
+
+    async def _run_refresh(self, key: str, scope) -> None:
+        received = False
+
+        async def receive():
+            nonlocal received
+            if received:
+                return {"type": "http.disconnect"}
+            received = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+
+        try:
+            response = await self._capture(scope, receive, None)
+            if response is not None:
+                await get_cache().namespace(MICROCACHE_NAMESPACE).set(
+                    key, response, ttl=self.ttl + self.stale_ttl
+                )
+        except Exception:
+            logger.exception("Refreshing the microcache entry %s failed", key)
@@ -0,0 +1,180 @@
+import asyncio
+import re
+from urllib.parse import unquote, urlsplit
+from .abstracts import CacheBackend, CacheBackendError
+
+# characters with a meaning in SCAN MATCH patterns
+GLOB_REGEX = re.compile(r"([*?\[\]\\])")
+
+SCAN_COUNT = 1000
+
+
+class RedisReplyError(CacheBackendError):
+    """An error reply of the server, the connection is still in sync after it"""
+
+
+class RedisConnection:
+    """A single connection speaking RESP2, commands are sent one at a time"""
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.reader = reader
+        self.writer = writer
+
+    @staticmethod
+    def encode(*args: str | bytes | int | float) -> bytes:
+        parts = [b"*%d\r\n" % len(args)]
+        for arg in args:
+            if not isinstance(arg, bytes):
+                arg = str(arg).encode()
+            parts.append(b"$%d\r\n%s\r\n" % (len(arg), arg))
+        return b"".join(parts)
+
+    async def read_reply(self):
+        line = await self.reader.readline()
+        if not line.endswith(b"\r\n"):
+            raise CacheBackendError("Connection closed by redis")
+        kind, payload = line[:1], line[1:-2]
+
+        if kind == b"+":
+            return payload.decode()
+        if kind == b"-":
+            raise RedisReplyError(payload.decode())
+        if kind in (b":", b"$", b"*"):
+            try:
+                number = int(payload)
+            except ValueError:
+                raise CacheBackendError(f"Unexpected redis reply {line!r}") from None
+        if kind == b":":
+            return number
+        if kind == b"$":
+            if number < 0:
+                return None
+            data = await self.reader.readexactly(number + 2)
+            return data[:-2]
+        if kind == b"*":
+            if number < 0:
+                return None
+            items, error = [], None
+            for _ in range(number):
+                # read the whole array even past an error element, so the
+                # next reply starts where it should
+                try:
+                    items.append(await self.read_reply())
+                except RedisReplyError as e:
+                    error = error or e
+            if error is not None:
+                raise error
+            return items
+        raise CacheBackendError(f"Unexpected redis reply {line!r}")
+
+    async def execute(self, *args: str | bytes | int | float):
+        self.writer.write(self.encode(*args))
+        await self.writer.drain()
+        return await self.read_reply()
+
+    async def close(self) -> None:
+        self.writer.close()
+        try:
+            await self.writer.wait_closed()
+        except OSError:
+            pass
+
+
+class RedisCacheBackend(CacheBackend):
+    """
+    Shared cache on a redis server through a small pool of plain asyncio
+    connections, `redis://[:password@]host[:port][/db]` urls are supported.
+    Evictions happen on the server and are not counted here.
+    """
+
+    shared = True
+
+    def __init__(self, url: str, pool_size: int = 10, timeout: float = 1) -> None:
+        parts = urlsplit(url)
+        if parts.scheme != "redis":
+            raise ValueError(f"Unsupported cache url scheme {parts.scheme!r}")
+        self.host = parts.hostname or "localhost"
+        self.port = parts.port or 6379
+        self.username = unquote(parts.username) if parts.username else None
+        self.password = unquote(parts.password) if parts.password else None
+        self.db = int(parts.path.lstrip("/") or 0)
+        self.timeout = timeout
+        self._idle: list[RedisConnection] = []
+        self._slots = asyncio.Semaphore(pool_size)
+
+    async def _connect(self) -> RedisConnection:
+        reader, writer = await asyncio.open_connection(self.host, self.port)
+        connection = RedisConnection(reader, writer)
+        try:
+            if self.password:
+                if self.username:
+                    await connection.execute("AUTH", self.username, self.password)
+                else:
+                    await connection.execute("AUTH", self.password)
+            if self.db:
+                await connection.execute("SELECT", self.db)
+        except BaseException:
+            await connection.close()
+            raise
+        return connection
+
+    async def execute(self, *args: str | bytes | int | float):
+        async with self._slots:
+            connection = self._idle.pop() if self._idle else None
+            try:
+                async with asyncio.timeout(self.timeout):
+                    if connection is None:
+                        connection = await self._connect()
+                    reply = await connection.execute(*args)
+            except RedisReplyError:
+                # the whole error reply was read, the connection is still in sync
+                if connection is not None:
+                    self._idle.append(connection)
+                raise
+            except CacheBackendError:
+                # closed by the server or a reply the parser could not follow,
+                # whatever comes next on this connection cannot be trusted
+                if connection is not None:
+                    await connection.close()
+                raise
+            except (OSError, asyncio.IncompleteReadError, TimeoutError) as e:
+                # a half read reply would desync the connection, drop it
+                if connection is not None:
+                    await connection.close()
+                raise CacheBackendError(f"Redis unavailable: {e!r}") from e
+            except BaseException:
+                if connection is not None:
+                    await connection.close()
+                raise
+            self._idle.append(connection)
+            return reply
+
+    async def get(self, key: str) -> bytes | None:
+        return await self.execute("GET", key)
+
+    async def set(self, key: str, value: bytes, ttl: float | None = None) -> None:
+        if ttl is None:
+            await self.execute("SET", key, value)
+        else:
+            await self.execute("SET", key, value, "PX", max(1, int(ttl * 1000)))
+
+    async def delete(self, *keys: str) -> None:
+        if keys:
+            await self.execute("DEL", *keys)
+
+    async def clear(self, prefix: str = "") -> None:
+        pattern = GLOB_REGEX.sub(r"\\\1", prefix) + "*"
+        cursor = b"0"
+        while True:
+            cursor, keys = await self.execute(
+                "SCAN", cursor, "MATCH", pattern, "COUNT", SCAN_COUNT
+            )
+            if keys:
+                await self.execute("UNLINK", *keys)
+            if cursor == b"0":
+                break
+
+    async def close(self) -> None:
+        idle, self._idle = self._idle, []
+        for connection in idle:
+            await connection.close()
@@ -0,0 +1,3 @@
+from .base import Cdn, CdnDependency, get_cdn, set_surrogate_keys
+
+__all__ = ["Cdn", "CdnDependency", "get_cdn", "set_surrogate_keys"]
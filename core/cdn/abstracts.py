@@ -0,0 +1,8 @@
+from abc import ABC, abstractmethod
+
+
+class PurgeAdapter(ABC):
+    @abstractmethod
+    async def purge(self, keys: list[str]) -> None:
+        """Evicts every edge cached response tagged with one of the surrogate keys"""
+        pass
@@ -0,0 +1,38 @@
+import httpx
+from .abstracts import PurgeAdapter
+
+
+class NoopPurgeAdapter(PurgeAdapter):
+    """No CDN in front of the app, nothing to purge"""
+
+    async def purge(self, keys: list[str]) -> None:
+        pass
+
+
+class RecordingPurgeAdapter(PurgeAdapter):
+    """Keeps the purged keys in memory, to check what a write would purge"""
+
+    def __init__(self) -> None:
+        self.purged: list[list[str]] = []
+
+    async def purge(self, keys: list[str]) -> None:
+        self.purged.append(keys)
+
+
+class WebhookPurgeAdapter(PurgeAdapter):
+    """
+    Posts `{"surrogate_keys": [...]}` to a purge endpoint, the CDN's own
+    purge-by-tag API or a small relay in front of it.
+    """
+
+    def __init__(self, url: str, token: str | None, timeout: float) -> None:
+        self.url = url
+        self.headers = {"Authorization": f"Bearer {token}"} if token else {}
+        self.timeout = timeout
+
+    async def purge(self, keys: list[str]) -> None:
+        async with httpx.AsyncClient(timeout=self.timeout) as client:
+            response = await client.post(
+                self.url, json={"surrogate_keys": keys}, headers=self.headers
+            )
+            response.raise_for_status()
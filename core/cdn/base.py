@@ -0,0 +1,66 @@
+import logging
+from collections.abc import Iterable
+from functools import lru_cache
+from typing import Annotated
+import httpx
+from fastapi import Depends, Response
+from core.config import CdnPurgeAdapter, get_config
+from .abstracts import PurgeAdapter
+from .adapters import NoopPurgeAdapter, RecordingPurgeAdapter, WebhookPurgeAdapter
+
+logger = logging.getLogger(__name__)
+
+# purge APIs cap the keys of a single call
+PURGE_BATCH_SIZE = 256
+
+
+class Cdn:
+    adapter: PurgeAdapter
+
+    def __init__(self) -> None:
+        config = get_config()
+        if config.cdn_purge_adapter == CdnPurgeAdapter.NONE:
+            self.adapter = NoopPurgeAdapter()
+        elif config.cdn_purge_adapter == CdnPurgeAdapter.RECORDING:
+            self.adapter = RecordingPurgeAdapter()
+        elif config.cdn_purge_adapter == CdnPurgeAdapter.WEBHOOK:
+            if not config.cdn_purge_url:
+                raise ValueError("The webhook purge adapter needs CDN_PURGE_URL")
+            self.adapter = WebhookPurgeAdapter(
+                config.cdn_purge_url, config.cdn_purge_token, config.cdn_purge_timeout
+            )
+        else:
+            raise ValueError(
+                "No CDN purge adapter configured. Did you forget to add config env variable?"
+            )
+
+    async def purge(self, *keys: str) -> None:
+        """
+        A failed purge is logged and not raised, the write is already committed
+        and the edge copy expires with its `s-maxage` at the latest.
+        """
+        unique = list(dict.fromkeys(keys))
+        for start in range(0, len(unique), PURGE_BATCH_SIZE):
+            batch = unique[start : start + PURGE_BATCH_SIZE]
+            try:
+                await self.adapter.purge(batch)
+            except (httpx.HTTPError, OSError) as e:
+                logger.error("CDN purge of %s failed: %s", batch, e)
+
+
+def set_surrogate_keys(
+    response: Response, keys: Iterable[str], cache_control: str
+) -> None:
+    """Tags a response for purging, `Surrogate-Key` for Fastly, `Cache-Tag` for Cloudflare"""
+    keys = list(dict.fromkeys(keys))
+    response.headers["Surrogate-Key"] = " ".join(keys)
+    response.headers["Cache-Tag"] = ",".join(keys)
+    response.headers["Cache-Control"] = cache_control
+
+
+@lru_cache
+def get_cdn() -> Cdn:
+    return Cdn()
+
+
+CdnDependency = Annotated[Cdn, Depends(get_cdn)]
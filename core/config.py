@@ -16,6 +16,17 @@ class FileStorage(str, Enum):
     S3 = "S3"
 
 
+class CacheBackendType(str, Enum):
+    MEMORY = "memory"
+    REDIS = "redis"
+
+
+class CdnPurgeAdapter(str, Enum):
+    NONE = "none"
+    RECORDING = "recording"
+    WEBHOOK = "webhook"
+
+
 class Config(BaseSettings):
     # from env file
     app_env: AppEnv
@@ -23,13 +34,45 @@ class Config(BaseSettings):
     app_url: str
     db_connection: str
     db_connection_sync: str
+    db_echo: bool = False
+    db_pool_size: int = 5
+    db_max_overflow: int = 10
+    db_pool_timeout: float = 30
+    db_pool_pre_ping: bool = True
+    db_pool_recycle: int = 1800
+    db_statement_cache_size: int = 100
+    db_pgbouncer_mode: bool = False
+    db_replica_connection: str | None = None
+    db_replica_sticky_seconds: int = 5
+    db_search_statement_timeout_ms: int = 3000
+    db_listen_connection: str | None = None
     jwt_secrete: str
     access_token_expire_minutes: int
+    jwt_permission_claims: bool = False
+    jwt_decode_cache_size: int = 1024
     css_version: str = "1.0"
     file_storage: FileStorage = FileStorage.LOCAL
     local_storage_path: str = "uploads"
+    # under root_path, memory-mapped by every worker of the host
+    slug_index_path: str = "data/slug_index"
     allowed_images: list[str] = []
     max_image_size_bytes: int = 1000 * 1000 * 5
+    cache_backend: CacheBackendType = CacheBackendType.MEMORY
+    cache_key_prefix: str = "cache"
+    cache_default_ttl: int = 60
+    cache_max_entries: int = 10000
+    cache_max_bytes: int = 1024 * 1024 * 64
+    cache_redis_url: str = "redis://localhost:6379/0"
+    cache_redis_pool_size: int = 10
+    cache_redis_timeout: float = 1
+    microcache_ttl: float = 5
+    microcache_stale_ttl: float = 30
+    auth_user_cache_ttl: float = 60
+    cdn_purge_adapter: CdnPurgeAdapter = CdnPurgeAdapter.NONE
+    cdn_purge_url: str | None = None
+    cdn_purge_token: str | None = None
+    cdn_purge_timeout: float = 5
+    cdn_cache_control: str = "public, max-age=0, must-revalidate, s-maxage=86400"
 
     model_config = SettingsConfigDict(env_file=".env", extra="ignore")
 
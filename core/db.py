@@ -1,13 +1,76 @@
-from typing import Annotated
-from fastapi import Depends
+import time
+from typing import Annotated, Any
+from uuid import uuid4
+from fastapi import Depends, Request
+from sqlalchemy import event, exc
 from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.orm import ORMExecuteState, Session, SessionTransaction
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 from core import get_config
 from sqlalchemy.ext.asyncio import async_sessionmaker, AsyncSession
 from .base_model import BaseModel
 
 config = get_config()
 
-async_engine = create_async_engine(config.db_connection, echo=True, future=True)
+
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    """Queue pool that records how long requests wait to check out a connection"""
+
+    def __init__(self, *args, **kw) -> None:
+        super().__init__(*args, **kw)
+        self.checkout_count = 0
+        self.timeout_count = 0
+        self.wait_time_total = 0.0
+        self.wait_time_max = 0.0
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            self.timeout_count += 1
+            raise
+        finally:
+            waited = time.perf_counter() - started
+            self.checkout_count += 1
+            self.wait_time_total += waited
+            self.wait_time_max = max(self.wait_time_max, waited)
+
+
+def _connect_args() -> dict[str, Any]:
+    if config.db_pgbouncer_mode:
+        # PgBouncer in transaction mode hands every transaction a possibly different
+        # server connection, so nothing may be cached per connection: no asyncpg
+        # statement caches and uniquely named prepared statements.
+        return {
+            "prepared_statement_cache_size": 0,
+            "statement_cache_size": 0,
+            "prepared_statement_name_func": lambda: f"__asyncpg_{uuid4()}__",
+        }
+    return {"prepared_statement_cache_size": config.db_statement_cache_size}
+
+
+def _create_engine(url: str):
+    return create_async_engine(
+        url,
+        echo=config.db_echo,
+        future=True,
+        poolclass=InstrumentedQueuePool,
+        pool_size=config.db_pool_size,
+        max_overflow=config.db_max_overflow,
+        pool_timeout=config.db_pool_timeout,
+        pool_pre_ping=config.db_pool_pre_ping,
+        pool_recycle=config.db_pool_recycle,
+        connect_args=_connect_args(),
+    )
+
+
+async_engine = _create_engine(config.db_connection)
+replica_engine = (
+    _create_engine(config.db_replica_connection)
+    if config.db_replica_connection
+    else None
+)
 
 
 async def create_db_and_tables():
@@ -15,10 +78,69 @@ async def create_db_and_tables():
         await conn.run_sync(BaseModel.metadata.create_all)
 
 
+class LazySyncSession(Session):
+    pass
+
+
+class LazySession(AsyncSession):
+    """
+    A session checks out a connection on its first statement only, so requests
+    answered from a cache or rejected before querying never touch the pool.
+    `release` ends a transaction that has not written anything, handing the
+    connection back right after the reads instead of at the end of the request.
+    """
+
+    sync_session_class = LazySyncSession
+
+    async def release(self) -> None:
+        if not self.in_transaction() or self.info.get("has_writes"):
+            return
+        if self.new or self.dirty or self.deleted:
+            return
+        # loaded objects stay usable, expire_on_commit is disabled
+        await self.commit()
+
+
+@event.listens_for(LazySyncSession, "after_flush")
+def _mark_flushed(session: Session, flush_context) -> None:
+    session.info["has_writes"] = True
+
+
+@event.listens_for(LazySyncSession, "do_orm_execute")
+def _mark_statement(orm_execute_state: ORMExecuteState) -> None:
+    if not orm_execute_state.is_select:
+        orm_execute_state.session.info["has_writes"] = True
+
+
+@event.listens_for(LazySyncSession, "after_begin")
+def _apply_statement_timeout(
+    session: Session, transaction: SessionTransaction, connection
+) -> None:
+    timeout_ms = session.info.get("statement_timeout_ms")
+    if timeout_ms:
+        # transaction scoped, nothing leaks into the pooled connection
+        connection.exec_driver_sql(f"SET LOCAL statement_timeout = {int(timeout_ms)}")
+
+
+@event.listens_for(LazySyncSession, "after_transaction_end")
+def _reset_writes(session: Session, transaction: SessionTransaction) -> None:
+    if transaction.parent is None:
+        session.info.pop("has_writes", None)
+
+
 async_session_factory = async_sessionmaker(
-    bind=async_engine, class_=AsyncSession, expire_on_commit=False
+    bind=async_engine, class_=LazySession, expire_on_commit=False
+)
+replica_session_factory = async_sessionmaker(
+    bind=replica_engine or async_engine, class_=LazySession, expire_on_commit=False
 )
 
+# set after a write, reads of that client stay on the primary until it expires
+PRIMARY_STICKY_COOKIE = "db_primary_until"
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+QUERY_CANCELED = "57014"
+UNIQUE_VIOLATION = "23505"
+
 
 async def get_session():
     session = async_session_factory()
@@ -26,4 +148,115 @@ async def get_session():
         yield session
 
 
-SessionDependency = Annotated[AsyncSession, Depends(get_session)]
+SessionDependency = Annotated[LazySession, Depends(get_session)]
+
+
+def reads_from_primary(request: Request) -> bool:
+    if replica_engine is None or request.method not in SAFE_METHODS:
+        return True
+    primary_until = request.cookies.get(PRIMARY_STICKY_COOKIE)
+    if not primary_until:
+        return False
+    try:
+        return float(primary_until) > time.time()
+    except ValueError:
+        return False
+
+
+async def get_read_session(request: Request):
+    """Session for read only handlers, served by the replica when one is configured"""
+    if reads_from_primary(request):
+        session = async_session_factory()
+    else:
+        session = replica_session_factory()
+    async with session:
+        yield session
+
+
+ReadSessionDependency = Annotated[LazySession, Depends(get_read_session)]
+
+
+async def _set_statement_timeout(session: LazySession, timeout_ms: int) -> None:
+    session.info["statement_timeout_ms"] = timeout_ms
+    if session.in_transaction():
+        connection = await session.connection()
+        await connection.exec_driver_sql(
+            f"SET LOCAL statement_timeout = {int(timeout_ms)}"
+        )
+
+
+class StatementTimeout:
+    """
+    Route dependency giving every statement of the request a deadline. Postgres
+    cancels a query that runs past it and the request fails with a 503 instead
+    of holding a connection and a worker for as long as the query takes.
+    """
+
+    def __init__(self, timeout_ms: int) -> None:
+        self.timeout_ms = timeout_ms
+
+    async def __call__(
+        self, session: SessionDependency, read_session: ReadSessionDependency
+    ) -> None:
+        await _set_statement_timeout(session, self.timeout_ms)
+        if read_session is not session:
+            await _set_statement_timeout(read_session, self.timeout_ms)
+
+
+def is_query_canceled(error: exc.DBAPIError) -> bool:
+    return getattr(error.orig, "sqlstate", None) == QUERY_CANCELED
+
+
+def violated_unique_constraint(error: exc.IntegrityError) -> str | None:
+    """Name of the unique constraint a write ran into, `None` for any other integrity error"""
+    if getattr(error.orig, "sqlstate", None) != UNIQUE_VIOLATION:
+        return None
+    # the driver exception carries the constraint, the adapted one only the message
+    return getattr(error.orig.__cause__, "constraint_name", None)
+
+
+class ReadYourWritesMiddleware:
+    """
+    Pins a client to the primary for `db_replica_sticky_seconds` after any
+    successful unsafe request so it never reads its own writes from a lagging replica.
+    """
+
+    def __init__(self, app, sticky_seconds: int) -> None:
+        self.app = app
+        self.sticky_seconds = sticky_seconds
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] in SAFE_METHODS:
+            await self.app(scope, receive, send)
+            return
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start" and message["status"] < 400:
+                primary_until = time.time() + self.sticky_seconds
+                cookie = (
+                    f"{PRIMARY_STICKY_COOKIE}={primary_until:.3f}; "
+                    f"Max-Age={self.sticky_seconds}; Path=/; HttpOnly; SameSite=Lax"
+                )
+                headers = list(message.get("headers", []))
+                headers.append((b"set-cookie", cookie.encode("latin-1")))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
+
+
+def get_pool_stats(engine=async_engine) -> dict[str, Any]:
+    """Snapshot of the engine pool, a growing wait time means requests queue for a connection"""
+    pool: InstrumentedQueuePool = engine.pool  # type: ignore
+    checkouts = pool.checkout_count
+    return {
+        "pool_size": pool.size(),
+        "max_overflow": config.db_max_overflow,
+        "checked_in": pool.checkedin(),
+        "checked_out": pool.checkedout(),
+        "overflow": max(pool.overflow(), 0),
+        "checkouts": checkouts,
+        "checkout_timeouts": pool.timeout_count,
+        "wait_time_avg_ms": (pool.wait_time_total / checkouts * 1000) if checkouts else 0.0,
+        "wait_time_max_ms": pool.wait_time_max * 1000,
+    }
@@ -1,6 +1,20 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
+
+# bounds one page, larger requests are rejected with a 422
+MAX_PER_PAGE = 100
 
 
 class PaginationQuery(BaseModel):
-    page: int = 1
-    per_page: int = 20
+    page: int = Field(default=1, ge=1)
+    per_page: int = Field(default=20, ge=1, le=MAX_PER_PAGE)
+    with_total: bool = True
+
+
+class CursorPaginationQuery(PaginationQuery):
+    # opaque cursor returned as `next_cursor`, switches the list to keyset mode
+    after: str | None = None
+    limit: int | None = Field(default=None, ge=1, le=MAX_PER_PAGE)
+
+    @property
+    def cursor_mode(self) -> bool:
+        return self.after is not None or self.limit is not None
@@ -5,9 +5,11 @@ from fastapi.responses import RedirectResponse
 from fastapi.exceptions import ResponseValidationError
 from fastapi.responses import JSONResponse
 from starlette.exceptions import HTTPException as StarletteHTTPException
+from sqlalchemy.exc import DBAPIError
 
 # <<< CHANGE: The specific ForbiddenException and NotFoundException imports are no longer needed
 from core.exceptions.common import UnAuthorizedException
+from core.db import is_query_canceled
 from core.jinja.helpers import get_template_rederer
 
 render = get_template_rederer()
@@ -70,4 +72,15 @@ def add_exception_handlers(app: FastAPI):
         return JSONResponse(
             status_code=500,
             content={"detail": "Server Error - " + str(exc)},
-        )
\ No newline at end of file
+        )
+
+    @app.exception_handler(DBAPIError)
+    async def db_exception_handler(request: Request, exc: DBAPIError):
+        if not is_query_canceled(exc):
+            return await global_exception_handler(request, exc)
+        detail = "Request took too long, please try again"
+        if wants_html(request):
+            return render(
+                request, "errors/http_error.html.j2", {"error": detail}, status_code=503
+            )
+        return JSONResponse(status_code=503, content={"detail": detail})
\ No newline at end of file
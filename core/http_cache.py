@@ -0,0 +1,77 @@
+"""
+Conditional GET helpers: strong ETags and `Last-Modified` validators computed
+from cheap version queries, and the `304 Not Modified` short circuit.
+"""
+
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Any
+from fastapi import Request, Response
+
+
+def make_etag(*parts: Any) -> str:
+    """Strong ETag of the parts, typically a scope and the versions of the rows"""
+    raw = "\x1f".join(
+        part.isoformat() if isinstance(part, datetime) else str(part) for part in parts
+    )
+    return '"%s"' % hashlib.blake2b(raw.encode(), digest_size=16).hexdigest()
+
+
+def latest(*values: Any) -> datetime | None:
+    """Most recent of the datetimes among `values`, e.g. the row of a version query"""
+    return max((value for value in values if isinstance(value, datetime)), default=None)
+
+
+def _utc(value: datetime) -> datetime:
+    # naive datetimes are stored as utc
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+def http_date(value: datetime) -> str:
+    return format_datetime(_utc(value), usegmt=True)
+
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    """Weak comparison as required for `If-None-Match`"""
+    if if_none_match.strip() == "*":
+        return True
+    candidates = (candidate.strip() for candidate in if_none_match.split(","))
+    return any(candidate.removeprefix("W/") == etag for candidate in candidates)
+
+
+def is_not_modified(
+    request: Request, etag: str, last_modified: datetime | None = None
+) -> bool:
+    """`If-None-Match` takes precedence, `If-Modified-Since` is only checked without it"""
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        return etag_matches(if_none_match, etag)
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since is None or last_modified is None:
+        return False
+    try:
+        since = parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False
+    # http dates have a one second resolution
+    return _utc(last_modified).replace(microsecond=0) <= _utc(since)
+
+
+def set_validators(
+    response: Response, etag: str, last_modified: datetime | None = None
+) -> None:
+    response.headers["ETag"] = etag
+    if last_modified is not None:
+        response.headers["Last-Modified"] = http_date(last_modified)
+    # stored, but checked with the validators before every reuse
+    response.headers.setdefault("Cache-Control", "no-cache")
+
+
+def not_modified(etag: str, last_modified: datetime | None = None) -> Response:
+    response = Response(status_code=304)
+    set_validators(response, etag, last_modified)
+    return response
@@ -0,0 +1,247 @@
+"""
+Cross-worker invalidation of in-process state over Postgres LISTEN/NOTIFY.
+
+Writes to the models registered with `watch_model` are collected per session,
+from the flushed instances and from the ids returned by `insert/update ...
+RETURNING` statements. They are published with `pg_notify` inside the writing
+transaction, so Postgres delivers them only if, and once, it commits. The
+writing worker runs its handlers from `after_commit`; every other worker runs
+them when `InvalidationListener` receives the notification.
+
+Handlers take the changed ids of their topic, `None` when they are unknown
+(bulk statements, or notifications possibly missed while reconnecting) and
+everything of the topic must be considered stale.
+"""
+
+import asyncio
+import json
+import logging
+from collections.abc import Awaitable, Callable
+from itertools import chain
+from uuid import uuid4
+import asyncpg
+from sqlalchemy import event, func, select
+from sqlalchemy.engine import CursorResult, Result, make_url
+from sqlalchemy.orm import ORMExecuteState, Session
+
+logger = logging.getLogger(__name__)
+
+CHANNEL = "invalidation"
+# notification payloads are limited to 8000 bytes
+MAX_IDS_PER_MESSAGE = 500
+RECONNECT_DELAY_SECONDS = 5
+# a silently dropped connection would stop invalidations without any error
+HEALTH_CHECK_SECONDS = 30
+
+# tells this worker's notifications apart, it already handled them on commit
+ORIGIN = uuid4().hex[:12]
+
+Handler = Callable[[list[int] | None], Awaitable[None]]
+
+_topics: dict[type, str] = {}
+# topic -> (handler, run for this worker's commits, run for the other workers')
+_handlers: dict[str, list[tuple[Handler, bool, bool]]] = {}
+# running dispatches, the loop only keeps weak references to tasks
+_dispatching: set[asyncio.Task] = set()
+
+
+def watch_model(model: type, topic: str) -> None:
+    _topics[model] = topic
+
+
+def on_invalidate(
+    topic: str, local: bool = True, remote: bool = True
+) -> Callable[[Handler], Handler]:
+    """
+    Registers a handler for the changes of `topic`. `local=False` skips the
+    commits of this worker, for state its write routes already update in place,
+    `remote=False` the other workers', for state they all share.
+    """
+
+    def decorator(handler: Handler) -> Handler:
+        _handlers.setdefault(topic, []).append((handler, local, remote))
+        return handler
+
+    return decorator
+
+
+def _pending(session: Session) -> dict[str, set[int] | None]:
+    return session.info.setdefault("invalidations", {})
+
+
+def _record(session: Session, topic: str, ids: list[int] | None) -> None:
+    pending = _pending(session)
+    if ids is None or pending.get(topic, set()) is None:
+        pending[topic] = None
+    else:
+        pending.setdefault(topic, set()).update(ids)
+    _notify(session, topic, ids)
+
+
+def _notify(session: Session, topic: str, ids: list[int] | None) -> None:
+    connection = session.connection()
+    if connection.dialect.name != "postgresql":
+        return
+    if ids is None:
+        chunks = [None]
+    else:
+        chunks = [
+            ids[start : start + MAX_IDS_PER_MESSAGE]
+            for start in range(0, len(ids), MAX_IDS_PER_MESSAGE)
+        ]
+    for chunk in chunks:
+        message = {"o": ORIGIN, "t": topic, "i": chunk}
+        payload = json.dumps(message, separators=(",", ":"))
+        connection.execute(select(func.pg_notify(CHANNEL, payload)))
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_flushed(session: Session, flush_context) -> None:
+    changed: dict[str, list[int]] = {}
+    # the session still holds its pre-flush state here
+    dirty = (instance for instance in session.dirty if session.is_modified(instance))
+    for instance in chain(session.new, dirty, session.deleted):
+        topic = _topics.get(type(instance))
+        if topic is not None:
+            changed.setdefault(topic, []).append(instance.id)
+    for topic, ids in changed.items():
+        _record(session, topic, ids)
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _collect_statement(orm_execute_state: ORMExecuteState):
+    if orm_execute_state.is_select:
+        return None
+    mapper = orm_execute_state.bind_mapper
+    topic = _topics.get(mapper.class_) if mapper is not None else None
+    if topic is None:
+        return None
+
+    result = orm_execute_state.invoke_statement()
+    if isinstance(result, CursorResult) and not result.returns_rows:
+        # without RETURNING the rows can't be told apart, the whole topic is stale
+        _record(orm_execute_state.session, topic, None)
+        return result
+
+    # read the returned rows once and hand the caller an identical result
+    frozen = result.freeze()
+    ids = _returned_ids(frozen(), mapper.class_)
+    _record(orm_execute_state.session, topic, ids)
+    return frozen()
+
+
+def _returned_ids(result: Result, model: type) -> list[int] | None:
+    """Ids of the returned entities or `id` column, `None` when neither was returned"""
+    keys = list(result.keys())
+    rows = result.all()
+    if rows and any(isinstance(value, model) for value in rows[0]):
+        index = next(i for i, value in enumerate(rows[0]) if isinstance(value, model))
+        return [row[index].id for row in rows]
+    if "id" in keys:
+        index = keys.index("id")
+        return [row[index] for row in rows]
+    return None if rows else []
+
+
+@event.listens_for(Session, "after_commit")
+def _dispatch_committed(session: Session) -> None:
+    pending = session.info.pop("invalidations", None)
+    if not pending:
+        return
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        # synchronous scripts have no in-process state to refresh
+        return
+    for topic, ids in pending.items():
+        _spawn(loop, dispatch(topic, sorted(ids) if ids is not None else None))
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_pending(session: Session) -> None:
+    session.info.pop("invalidations", None)
+
+
+def _spawn(loop: asyncio.AbstractEventLoop, coroutine) -> None:
+    task = loop.create_task(coroutine)
+    _dispatching.add(task)
+    task.add_done_callback(_dispatching.discard)
+
+
+async def dispatch(topic: str, ids: list[int] | None, remote: bool = False) -> None:
+    for handler, local, run_remote in _handlers.get(topic, ()):
+        if not (run_remote if remote else local):
+            continue
+        try:
+            await handler(ids)
+        except Exception:
+            logger.exception("Invalidation handler %s of %s failed", handler, topic)
+
+
+class InvalidationListener:
+    """
+    Keeps a dedicated connection LISTENing on `CHANNEL` and dispatches the
+    notifications of the other workers. LISTEN needs a session level
+    connection, under PgBouncer transaction pooling point `dsn` at Postgres.
+    """
+
+    def __init__(self, dsn: str) -> None:
+        # asyncpg wants a plain postgresql:// url
+        url = make_url(dsn).set(drivername="postgresql")
+        self.dsn = url.render_as_string(hide_password=False)
+        self._task: asyncio.Task | None = None
+
+    def start(self) -> None:
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+    def _on_notification(self, connection, pid, channel: str, payload: str) -> None:
+        try:
+            message = json.loads(payload)
+        except ValueError:
+            message = None
+        if not isinstance(message, dict):
+            logger.warning("Ignoring malformed invalidation %r", payload)
+            return
+        if message.get("o") == ORIGIN:
+            return
+
+        topic, ids = message.get("t"), message.get("i")
+        valid_ids = ids is None or (
+            isinstance(ids, list)
+            and all(isinstance(id, int) and not isinstance(id, bool) for id in ids)
+        )
+        if not isinstance(topic, str) or not valid_ids:
+            logger.warning("Ignoring malformed invalidation %r", payload)
+            return
+        _spawn(asyncio.get_running_loop(), dispatch(topic, ids, remote=True))
+
+    async def _run(self) -> None:
+        first_attempt = True
+        while True:
+            connection = None
+            try:
+                connection = await asyncpg.connect(self.dsn)
+                await connection.add_listener(CHANNEL, self._on_notification)
+                if not first_attempt:
+                    # whatever changed while disconnected was never heard
+                    for topic in list(_handlers):
+                        await dispatch(topic, None, remote=True)
+                first_attempt = False
+                while True:
+                    await asyncio.sleep(HEALTH_CHECK_SECONDS)
+                    await connection.fetchval("SELECT 1")
+            except (OSError, asyncpg.PostgresError, asyncpg.InterfaceError) as e:
+                logger.warning("Invalidation listener disconnected: %s", e)
+            finally:
+                first_attempt = False
+                if connection is not None and not connection.is_closed():
+                    await connection.close()
+            await asyncio.sleep(RECONNECT_DELAY_SECONDS)
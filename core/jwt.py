@@ -1,11 +1,17 @@
 # core/jwt.py
 
+import time
+from collections import OrderedDict
 from datetime import datetime, timedelta, timezone
 from typing import Annotated, Any
 from fastapi import Depends
 import jwt
 from core import ConfigDepedency
 
+# token -> verified payload, most recently used last. Repeated requests with
+# the same bearer skip the signature check until the token expires.
+_decoded: OrderedDict[str, dict[str, Any]] = OrderedDict()
+
 
 class JwtUtils:
     def __init__(self, app_config: ConfigDepedency) -> None:
@@ -28,13 +34,25 @@ class JwtUtils:
         return encoded_jwt
 
     def get_payload(self, token: str) -> dict[str, Any] | None:
+        payload = _decoded.get(token)
+        if payload is not None:
+            if payload["exp"] > time.time():
+                _decoded.move_to_end(token)
+                return payload
+            del _decoded[token]
+            return None
+
         try:
             payload = jwt.decode(
                 token, self.app_config.jwt_secrete, algorithms=["HS256"]
             )
-            return payload
         except jwt.InvalidTokenError:
             return None
+        if self.app_config.jwt_decode_cache_size > 0 and "exp" in payload:
+            _decoded[token] = payload
+            if len(_decoded) > self.app_config.jwt_decode_cache_size:
+                _decoded.popitem(last=False)
+        return payload
 
 
 JwtUtilsDepedency = Annotated[JwtUtils, Depends()]
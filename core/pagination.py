@@ -0,0 +1,217 @@
+import base64
+import binascii
+import json
+import time
+from datetime import datetime
+from enum import Enum
+from typing import Any
+from sqlalchemy import Select, func, select, text, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.expression import ClauseElement, Executable
+from core.dtos import CursorPaginationQuery, PaginationQuery
+from core.exceptions.common import FieldValidationError
+from core.responses import PaginatedResponse
+
+
+class CountStrategy(str, Enum):
+    EXACT = "exact"
+    ESTIMATED = "estimated"
+    CACHED = "cached"
+
+
+class explain(Executable, ClauseElement):
+    """`EXPLAIN (FORMAT JSON)` of a select, bound parameters are kept as is"""
+
+    inherit_cache = False
+
+    def __init__(self, statement: Select) -> None:
+        self.statement = statement
+
+
+@compiles(explain, "postgresql")
+def _compile_explain(element: explain, compiler, **kw):
+    return "EXPLAIN (FORMAT JSON) " + compiler.process(element.statement, **kw)
+
+
+# compiled sql + params -> (expires_at, total), per worker
+_count_cache: dict[str, tuple[float, int]] = {}
+_COUNT_CACHE_MAX_ENTRIES = 1024
+
+
+def encode_cursor(created_at: datetime, id: int) -> str:
+    """Encodes the `(created_at, id)` keyset of a row into an opaque url-safe cursor"""
+    raw = json.dumps([created_at.isoformat(), id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, int]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, id = json.loads(base64.urlsafe_b64decode(padded))
+        return datetime.fromisoformat(created_at), int(id)
+    except (binascii.Error, ValueError, TypeError):
+        raise FieldValidationError("query", field_name="after", msg="Invalid cursor")
+
+
+def _is_entity_query(query: Select) -> bool:
+    descriptions = query.column_descriptions
+    return len(descriptions) == 1 and isinstance(descriptions[0]["expr"], type)
+
+
+async def _fetch_rows(session: AsyncSession, query: Select) -> list[Any]:
+    """ORM entities for `select(Model)`, plain rows for column projections"""
+    if _is_entity_query(query):
+        return list((await session.scalars(query)).all())
+    return list((await session.execute(query)).all())
+
+
+async def paginate_by_cursor(
+    session: AsyncSession, query: Select, qs: CursorPaginationQuery, model: Any
+) -> PaginatedResponse:
+    """
+    Keyset pagination ordered by `(created_at, id)` newest first.
+    `model` must expose `created_at` and `id` columns backed by a composite index,
+    every page is then a single index range scan regardless of its depth.
+    """
+    limit = qs.limit or qs.per_page
+    query = query.order_by(model.created_at.desc(), model.id.desc())
+
+    if qs.after:
+        created_at, id = decode_cursor(qs.after)
+        query = query.where(tuple_(model.created_at, model.id) < tuple_(created_at, id))
+
+    # one extra row tells us whether there is a next page without counting
+    rows = await _fetch_rows(session, query.limit(limit + 1))
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(rows[-1].created_at, rows[-1].id)
+
+    return PaginatedResponse(
+        data=rows, page=qs.page, per_page=limit, next_cursor=next_cursor
+    )
+
+
+async def exact_count(session: AsyncSession, query: Select) -> int:
+    total = await session.scalar(select(func.count()).select_from(query.subquery()))
+    return total or 0
+
+
+async def estimate_count(session: AsyncSession, query: Select) -> int:
+    """
+    Row count estimate without scanning the table. Unfiltered single table queries
+    read `pg_class.reltuples`, anything else uses the planner's row estimate.
+    Falls back to an exact count for tables that were never analyzed.
+    """
+    tables = query.get_final_froms()
+    if query.whereclause is None and len(tables) == 1 and hasattr(tables[0], "name"):
+        reltuples = await session.scalar(
+            text("SELECT reltuples::bigint FROM pg_class WHERE oid = to_regclass(:name)"),
+            {"name": f'"{tables[0].name}"'},
+        )
+        if reltuples is not None and reltuples >= 0:
+            return int(reltuples)
+        return await exact_count(session, query)
+
+    plan = await session.scalar(explain(query))
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+def _count_cache_key(query: Select) -> str:
+    compiled = query.compile()
+    return f"{compiled}|{sorted(compiled.params.items())!r}"
+
+
+def _get_cached_count(key: str) -> int | None:
+    cached = _count_cache.get(key)
+    if cached is None:
+        return None
+    expires_at, total = cached
+    if expires_at < time.monotonic():
+        _count_cache.pop(key, None)
+        return None
+    return total
+
+
+def _set_cached_count(key: str, total: int, ttl: int) -> None:
+    if len(_count_cache) >= _COUNT_CACHE_MAX_ENTRIES:
+        _count_cache.pop(next(iter(_count_cache)))
+    _count_cache[key] = (time.monotonic() + ttl, total)
+
+
+async def paginate(
+    session: AsyncSession,
+    qs: PaginationQuery,
+    query: Select,
+    with_total: bool | None = None,
+    count_strategy: CountStrategy = CountStrategy.EXACT,
+    count_cache_ttl: int = 60,
+) -> PaginatedResponse:
+    """
+    Offset pagination in a single round trip. The total is read from a
+    `count(*) OVER ()` window next to every row instead of a separate count query.
+    `with_total` overrides `qs.with_total`; when disabled no count is computed at all.
+
+    `count_strategy` trades accuracy for speed on large tables: `ESTIMATED` asks
+    the planner instead of counting and `CACHED` reuses an exact total for
+    `count_cache_ttl` seconds.
+    """
+    if with_total is None:
+        with_total = qs.with_total
+    offset = (qs.page - 1) * qs.per_page
+    page_query = query.limit(qs.per_page).offset(offset)
+
+    if not with_total:
+        return PaginatedResponse(
+            data=await _fetch_rows(session, page_query),
+            page=qs.page,
+            per_page=qs.per_page,
+        )
+
+    if count_strategy == CountStrategy.ESTIMATED:
+        total = await estimate_count(session, query)
+        return PaginatedResponse(
+            data=await _fetch_rows(session, page_query),
+            page=qs.page,
+            per_page=qs.per_page,
+            total=total,
+        )
+
+    cache_key = None
+    if count_strategy == CountStrategy.CACHED:
+        cache_key = _count_cache_key(query)
+        total = _get_cached_count(cache_key)
+        if total is not None:
+            return PaginatedResponse(
+                data=await _fetch_rows(session, page_query),
+                page=qs.page,
+                per_page=qs.per_page,
+                total=total,
+            )
+
+    windowed_query = (
+        query.add_columns(func.count().over().label("_total"))
+        .limit(qs.per_page)
+        .offset(offset)
+    )
+    rows = (await session.execute(windowed_query)).all()
+
+    if rows:
+        total = rows[0][-1]
+    elif offset == 0:
+        total = 0
+    else:
+        # page past the end, the window has no row to carry the total
+        total = await exact_count(session, query)
+
+    if cache_key is not None:
+        _set_cached_count(cache_key, total, count_cache_ttl)
+
+    if _is_entity_query(query):
+        rows = [row[0] for row in rows]
+
+    return PaginatedResponse(data=rows, page=qs.page, per_page=qs.per_page, total=total)
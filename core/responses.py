@@ -10,4 +10,5 @@ class PaginatedResponse(BaseModel):
     data: Any | None = None
     per_page: int
     page: int
-    total: int
+    total: int | None = None
+    next_cursor: str | None = None
@@ -0,0 +1,30 @@
+from typing import Any
+from sqlalchemy import Select, func, or_
+
+
+def escape_like(term: str, escape: str = "\\") -> str:
+    """Escapes LIKE wildcards so user input only ever matches literally"""
+    return (
+        term.replace(escape, escape * 2)
+        .replace("%", escape + "%")
+        .replace("_", escape + "_")
+    )
+
+
+def trigram_search(query: Select, term: str, *columns: Any) -> Select:
+    """
+    Substring search over `columns`, best match first.
+    Each column needs a `gin_trgm_ops` index: the `ILIKE '%term%'` filters are
+    answered by (a bitmap OR of) those indexes instead of a sequential scan and
+    the rows are ordered by their best `similarity()` to `term`, equal scores by
+    descending id of the columns' model so pages don't overlap.
+    """
+    pattern = f"%{escape_like(term)}%"
+    if len(columns) == 1:
+        score = func.similarity(columns[0], term)
+    else:
+        score = func.greatest(*(func.similarity(column, term) for column in columns))
+
+    return query.where(
+        or_(*(column.ilike(pattern, escape="\\") for column in columns))
+    ).order_by(score.desc(), columns[0].class_.id.desc())
@@ -0,0 +1,94 @@
+"""
+Coalescing of identical concurrent reads. Callers asking for a key that is
+already being computed await that computation instead of starting their own;
+nothing is kept once it finishes, so no caller gets a result from a flight that
+ended before it asked.
+
+Every caller of a flight gets the same object, treat it as read-only. Results
+must not depend on the caller: ORM instances stay attached to the session of
+the caller that loaded them, share plain rows, dicts and DTOs instead.
+"""
+
+import asyncio
+import functools
+import inspect
+from collections.abc import Awaitable, Callable, Hashable
+from typing import Any, ParamSpec, TypeVar
+from sqlalchemy.ext.asyncio import AsyncSession
+from core.cache.base import call_key, make_key
+
+P = ParamSpec("P")
+T = TypeVar("T")
+
+
+class SingleFlight:
+    def __init__(self) -> None:
+        self._flights: dict[Hashable, asyncio.Future] = {}
+
+    def __len__(self) -> int:
+        return len(self._flights)
+
+    async def do(self, key: Hashable, factory: Callable[[], Awaitable[T]]) -> T:
+        while (flight := self._flights.get(key)) is not None:
+            try:
+                # shielded, a cancelled follower leaves the flight running
+                return await asyncio.shield(flight)
+            except asyncio.CancelledError:
+                if not flight.cancelled():
+                    raise
+                # the caller running it was cancelled, one of the others takes over
+
+        flight = asyncio.get_running_loop().create_future()
+        self._flights[key] = flight
+        try:
+            result = await factory()
+        except asyncio.CancelledError:
+            flight.cancel()
+            raise
+        except BaseException as e:
+            flight.set_exception(e)
+            # retrieved, nobody else may be waiting for it
+            flight.exception()
+            raise
+        else:
+            flight.set_result(result)
+            return result
+        finally:
+            del self._flights[key]
+
+
+flights = SingleFlight()
+
+
+def single_flight(
+    namespace: str, key: Callable[..., Any] | None = None
+) -> Callable[[Callable[P, Awaitable[T]]], Callable[P, Awaitable[T]]]:
+    """
+    Coalesces concurrent calls of an async service function or route handler,
+    keyed like `cached`: by `key(*args, **kwargs)` when given, the plain
+    arguments otherwise. Injected sessions only count by their engine: callers
+    reading from the primary never join a flight running on a replica, the
+    callers of a flight all wait on the session of the first one.
+    """
+
+    def decorator(func: Callable[P, Awaitable[T]]) -> Callable[P, Awaitable[T]]:
+        signature = inspect.signature(func)
+
+        @functools.wraps(func)
+        async def wrapper(*args: P.args, **kwargs: P.kwargs) -> T:
+            if key is not None:
+                call = make_key(key(*args, **kwargs))
+            else:
+                call = call_key(signature, *args, **kwargs)
+            binds = tuple(
+                arg.bind
+                for arg in (*args, *kwargs.values())
+                if isinstance(arg, AsyncSession)
+            )
+            return await flights.do(
+                (namespace, binds, call), lambda: func(*args, **kwargs)
+            )
+
+        return wrapper
+
+    return decorator
@@ -1,16 +1,21 @@
 # In main.py
 
 import apps.load_model  # noqa
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.staticfiles import StaticFiles
 from starlette.middleware.cors import CORSMiddleware # <<< FIX: Import CORSMiddleware
 from core import get_config
+from core.cache import MicrocacheMiddleware, clear_microcache, get_cache
+from core.db import PRIMARY_STICKY_COOKIE, ReadYourWritesMiddleware, replica_engine
 from core.exceptions.handlers import add_exception_handlers
+from core.invalidation import InvalidationListener, on_invalidate
 from apps.auth.routes import auth_router
 from apps.mails.routes import mail_router
 from apps.images.routes import image_router
 from apps.account.routes import account_router
 from apps.blogs.routes import blog_router, blog_category_router
+from apps.blogs.indexing import load_blog_indexes
 from apps.admin.routes import router as admin_router
 from apps.errors.routes import router as error_router
 from starlette.middleware.sessions import SessionMiddleware
@@ -20,7 +25,43 @@ from pathlib import Path
 config = get_config()
 
 
-app = FastAPI(title=config.app_name)
+async def clear_worker_microcache(ids: list[int] | None) -> None:
+    await clear_microcache()
+
+
+# cached pages embed blogs, categories and thumbnails. The writing worker clears
+# its microcache right before purging the CDN (apps.blogs.surrogate_keys), the
+# other workers' in-process ones are cleared when the notification arrives
+if not get_cache().backend.shared:
+    for topic in ("blog", "blog_category", "image"):
+        on_invalidate(topic, local=False)(clear_worker_microcache)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    listener = InvalidationListener(
+        config.db_listen_connection or config.db_connection
+    )
+    listener.start()
+    await load_blog_indexes()
+    yield
+    await listener.stop()
+    await get_cache().close()
+
+
+app = FastAPI(title=config.app_name, lifespan=lifespan)
+
+# innermost, cached responses still get the cors and session headers
+app.add_middleware(
+    MicrocacheMiddleware,
+    paths=[
+        r"/blogs/(?!(?:search|suggest)$)[^/]*",
+        r"/blog_categories/[^/]*",
+    ],
+    ttl=config.microcache_ttl,
+    stale_ttl=config.microcache_stale_ttl,
+    bypass_cookies=["auth_token", PRIMARY_STICKY_COOKIE],
+)
 
 app.add_middleware(
     CORSMiddleware,
@@ -42,6 +83,11 @@ app.add_middleware(
 # existing middlewares
 app.add_middleware(SessionMiddleware, secret_key=config.jwt_secrete, https_only=True)
 
+if replica_engine is not None:
+    app.add_middleware(
+        ReadYourWritesMiddleware, sticky_seconds=config.db_replica_sticky_seconds
+    )
+
 # static files
 app.mount("/static", StaticFiles(directory=config.static_path), name="static")
 app.mount(
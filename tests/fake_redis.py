@@ -0,0 +1,143 @@
+"""
+In-process RESP2 server with the few commands `RedisCacheBackend` sends, so
+the client can be tested without a redis server.
+"""
+
+import asyncio
+import re
+import time
+from core.cache.redis import RedisConnection
+
+
+def glob_to_regex(pattern: str) -> re.Pattern:
+    """Redis MATCH patterns: `*`, `?`, `[...]` and backslash escapes"""
+    parts, index = [], 0
+    while index < len(pattern):
+        char = pattern[index]
+        if char == "\\" and index + 1 < len(pattern):
+            index += 1
+            parts.append(re.escape(pattern[index]))
+        elif char == "*":
+            parts.append(".*")
+        elif char == "?":
+            parts.append(".")
+        elif char == "[" and (end := pattern.find("]", index + 1)) > index:
+            parts.append(pattern[index : end + 1])
+            index = end
+        else:
+            parts.append(re.escape(char))
+        index += 1
+    return re.compile("".join(parts), re.DOTALL)
+
+
+class FakeRedisServer:
+    """
+    Keys live in `data` as `key -> (value, expires_at)`. `delay` holds every
+    reply back that many seconds, `replies` sends raw bytes instead of the
+    reply to a command and `drop_connections` closes the open connections the
+    way a restarted server would.
+    """
+
+    def __init__(self, password: str | None = None, scan_page: int = 2) -> None:
+        self.password = password
+        self.scan_page = scan_page
+        self.data: dict[bytes, tuple[bytes, float | None]] = {}
+        self.commands: list[list[bytes]] = []
+        self.connections = 0
+        self.delay = 0.0
+        self.replies: dict[str, bytes] = {}
+        self._scan_keys: list[bytes] = []
+        self._writers: set[asyncio.StreamWriter] = set()
+        self._server: asyncio.Server | None = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.sockets[0].getsockname()[:2]
+        auth = f":{self.password}@" if self.password else ""
+        return f"redis://{auth}{host}:{port}/0"
+
+    async def start(self) -> None:
+        self._server = await asyncio.start_server(self._handle, "127.0.0.1", 0)
+
+    async def stop(self) -> None:
+        self.drop_connections()
+        self._server.close()
+        await self._server.wait_closed()
+
+    def drop_connections(self) -> None:
+        for writer in self._writers:
+            writer.close()
+        self._writers.clear()
+
+    def _get(self, key: bytes) -> bytes | None:
+        value, expires_at = self.data.get(key, (None, None))
+        if expires_at is not None and expires_at <= time.monotonic():
+            del self.data[key]
+            return None
+        return value
+
+    async def _handle(self, reader, writer) -> None:
+        self.connections += 1
+        self._writers.add(writer)
+        connection = RedisConnection(reader, writer)
+        authenticated = self.password is None
+        try:
+            while True:
+                command = await connection.read_reply()
+                self.commands.append(command)
+                name, args = command[0].decode().upper(), command[1:]
+                if name == "AUTH":
+                    authenticated = args[-1].decode() == self.password
+                    reply = b"+OK\r\n" if authenticated else b"-WRONGPASS\r\n"
+                elif name in self.replies:
+                    reply = self.replies[name]
+                elif not authenticated:
+                    reply = b"-NOAUTH Authentication required\r\n"
+                else:
+                    reply = self._execute(name, args)
+                if self.delay:
+                    await asyncio.sleep(self.delay)
+                writer.write(reply)
+                await writer.drain()
+        except Exception:
+            pass
+        finally:
+            self._writers.discard(writer)
+            writer.close()
+
+    def _execute(self, name: str, args: list[bytes]) -> bytes:
+        if name == "SELECT":
+            return b"+OK\r\n"
+        if name == "GET":
+            value = self._get(args[0])
+            return b"$-1\r\n" if value is None else RedisConnection.encode(value)[4:]
+        if name == "SET":
+            expires_at = None
+            if len(args) == 4 and args[2].upper() == b"PX":
+                expires_at = time.monotonic() + int(args[3]) / 1000
+            self.data[args[0]] = (args[1], expires_at)
+            return b"+OK\r\n"
+        if name in ("DEL", "UNLINK"):
+            removed = sum(self.data.pop(key, None) is not None for key in args)
+            return b":%d\r\n" % removed
+        if name == "SCAN":
+            # args: cursor MATCH pattern COUNT n. Pages of `scan_page` keys over
+            # the keys there were when the scan started, like redis every key
+            # present for the whole scan is returned even if others are removed
+            cursor, pattern = int(args[0]), glob_to_regex(args[2].decode())
+            if cursor == 0:
+                self._scan_keys = sorted(self.data)
+            page = self._scan_keys[cursor : cursor + self.scan_page]
+            following = cursor + self.scan_page
+            matched = [
+                key
+                for key in page
+                if key in self.data and pattern.fullmatch(key.decode())
+            ]
+            next_cursor = str(following if following < len(self._scan_keys) else 0)
+            return (
+                b"*2\r\n"
+                + RedisConnection.encode(next_cursor)[4:]
+                + RedisConnection.encode(*matched)
+            )
+        return b"-ERR unknown command '%s'\r\n" % name.encode()
@@ -0,0 +1,185 @@
+"""
+The public list endpoints build their DTOs from column projections instead of
+ORM entities, both must give the same response.
+"""
+
+from datetime import datetime
+import pytest
+from sqlalchemy import Select, create_engine, literal, select
+from apps.auth.models import User
+from apps.blogs.dtos import BlogCategoryReadList, BlogRead
+from apps.blogs.models import Blog, BlogCategory
+from apps.blogs.queries import (
+    blog_category_list_query,
+    blog_category_row_to_dict,
+    blog_list_query,
+    blog_row_to_dict,
+)
+from apps.images.dtos import ImageRead
+from apps.images.models import Image
+from apps.images.queries import image_list_query, image_row_to_dict
+
+CREATED_AT = datetime(2025, 1, 1, 8, 30)
+UPDATED_AT = datetime(2025, 2, 1, 9, 45)
+
+
+@pytest.fixture(scope="module")
+def connection():
+    engine = create_engine("sqlite://")
+    with engine.connect() as connection:
+        yield connection
+    engine.dispose()
+
+
+def projected_row(connection, query: Select, **values):
+    """A row with the labels and types of `query`, holding `values`"""
+    columns = query.selected_columns
+    return connection.execute(
+        select(
+            *(
+                literal(values.get(name), type_=column.type).label(name)
+                for name, column in columns.items()
+            )
+        )
+    ).one()
+
+
+def make_user() -> User:
+    return User(id=3, name="alice")
+
+
+def make_image(**values) -> Image:
+    return Image(
+        id=7,
+        url="/uploads/cat.png",
+        alt_text="a cat",
+        title="Cat",
+        user_id=3,
+        created_at=CREATED_AT,
+        **values,
+    )
+
+
+def make_blog(**values) -> Blog:
+    return Blog(
+        id=1,
+        slug="first-post",
+        title="First post",
+        is_published=True,
+        short_desc="About the first post",
+        content="<p>Long body</p>",
+        created_at=CREATED_AT,
+        updated_at=UPDATED_AT,
+        **values,
+    )
+
+
+def test_blog_list_projection(connection):
+    category = BlogCategory(id=2, slug="ai", name="AI")
+    image = make_image()
+    blog = make_blog(category_id=2, category=category, thumbnail_id=7, thumbnail=image)
+
+    row = projected_row(
+        connection,
+        blog_list_query(),
+        **BlogRead.model_validate(blog, from_attributes=True).model_dump(
+            exclude={"category", "thumbnail"}
+        ),
+        category_name="AI",
+        thumbnail_url="/uploads/cat.png",
+    )
+
+    assert BlogRead.model_validate(blog_row_to_dict(row)) == BlogRead.model_validate(
+        blog, from_attributes=True
+    )
+
+
+def test_blog_list_projection_without_relations(connection):
+    blog = make_blog(category_id=None, category=None, thumbnail_id=None, thumbnail=None)
+
+    row = projected_row(
+        connection,
+        blog_list_query(),
+        **BlogRead.model_validate(blog, from_attributes=True).model_dump(
+            exclude={"category", "thumbnail"}
+        ),
+    )
+
+    projected = BlogRead.model_validate(blog_row_to_dict(row))
+    assert projected == BlogRead.model_validate(blog, from_attributes=True)
+    assert projected.category is None and projected.thumbnail is None
+
+
+def test_category_list_projection(connection):
+    image = make_image()
+    category = BlogCategory(
+        id=2, slug="ai", name="AI", created_at=CREATED_AT, thumbnail_id=7, thumbnail=image
+    )
+
+    row = projected_row(
+        connection,
+        blog_category_list_query(),
+        id=2,
+        slug="ai",
+        name="AI",
+        created_at=CREATED_AT,
+        thumbnail_id=7,
+        thumbnail_url="/uploads/cat.png",
+    )
+
+    assert BlogCategoryReadList.model_validate(
+        blog_category_row_to_dict(row)
+    ) == BlogCategoryReadList.model_validate(category, from_attributes=True)
+
+
+def test_image_list_projection(connection):
+    image = make_image(uploaded_by=make_user())
+
+    row = projected_row(
+        connection,
+        image_list_query(),
+        id=7,
+        url="/uploads/cat.png",
+        alt_text="a cat",
+        title="Cat",
+        user_id=3,
+        created_at=CREATED_AT,
+        uploaded_by_name="alice",
+    )
+
+    assert ImageRead.model_validate(image_row_to_dict(row)) == ImageRead.model_validate(
+        image, from_attributes=True
+    )
+
+
+def test_response_fields_are_unchanged():
+    assert list(BlogRead.model_fields) == [
+        "id",
+        "slug",
+        "title",
+        "is_published",
+        "short_desc",
+        "created_at",
+        "updated_at",
+        "category_id",
+        "category",
+        "thumbnail_id",
+        "thumbnail",
+        "snippet",
+    ]
+    assert list(BlogCategoryReadList.model_fields) == [
+        "id",
+        "slug",
+        "name",
+        "thumbnail_id",
+        "thumbnail",
+    ]
+    assert list(ImageRead.model_fields) == [
+        "id",
+        "url",
+        "alt_text",
+        "title",
+        "user_id",
+        "created_at",
+        "uploaded_by",
+    ]
@@ -0,0 +1,197 @@
+import asyncio
+import pytest
+from core.cache import Cache, CacheBackendError, RedisCacheBackend, RedisReplyError
+from .fake_redis import FakeRedisServer
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+@pytest.fixture
+async def server():
+    server = FakeRedisServer()
+    await server.start()
+    yield server
+    await server.stop()
+
+
+@pytest.fixture
+async def backend(server):
+    backend = RedisCacheBackend(server.url, pool_size=2, timeout=0.2)
+    yield backend
+    await backend.close()
+
+
+def commands(server: FakeRedisServer, name: bytes) -> list[list[bytes]]:
+    return [command for command in server.commands if command[0] == name]
+
+
+@pytest.mark.anyio
+async def test_set_get_delete(backend):
+    await backend.set("a", b"1")
+    await backend.set("b", b"\r\n binary \x00")
+
+    assert await backend.get("a") == b"1"
+    assert await backend.get("b") == b"\r\n binary \x00"
+    assert await backend.get("missing") is None
+
+    await backend.delete("a", "missing")
+    assert await backend.get("a") is None
+    assert await backend.get("b") is not None
+
+
+@pytest.mark.anyio
+async def test_set_with_ttl(server, backend):
+    await backend.set("a", b"1", ttl=0.05)
+
+    assert commands(server, b"SET")[-1][3:] == [b"PX", b"50"]
+    assert await backend.get("a") == b"1"
+    await asyncio.sleep(0.06)
+    assert await backend.get("a") is None
+
+
+@pytest.mark.anyio
+async def test_cache_values_round_trip(backend):
+    cache = Cache(backend, prefix="test")
+
+    await cache.set("page", {"data": [1, 2], "total": 2})
+
+    assert await cache.get("page") == {"data": [1, 2], "total": 2}
+    assert await cache.get("missing", "default") == "default"
+    assert (cache.stats.hits, cache.stats.misses) == (1, 1)
+
+
+@pytest.mark.anyio
+async def test_clear_scans_the_prefix(server, backend):
+    cache = Cache(backend, prefix="test")
+    blogs = cache.namespace("blogs")
+    for index in range(5):
+        await blogs.set(f"page-{index}", index)
+    await cache.namespace("blogs-archive").set("page", 1)
+    await cache.set("other", 1)
+
+    await blogs.clear()
+
+    # more keys than fit in one SCAN page
+    assert len(commands(server, b"SCAN")) > 1
+    assert all(command[3] == b"test:blogs:*" for command in commands(server, b"SCAN"))
+    assert [await blogs.get(f"page-{index}") for index in range(5)] == [None] * 5
+    assert await cache.namespace("blogs-archive").get("page") == 1
+    assert await cache.get("other") == 1
+
+
+@pytest.mark.anyio
+async def test_clear_escapes_glob_characters(server, backend):
+    await backend.set("a*:1", b"1")
+    await backend.set("ab:1", b"1")
+
+    await backend.clear("a*:")
+
+    assert commands(server, b"SCAN")[0][3] == rb"a\*:*"
+    assert await backend.get("a*:1") is None
+    assert await backend.get("ab:1") == b"1"
+
+
+@pytest.mark.anyio
+async def test_connections_are_pooled(server, backend):
+    await asyncio.gather(*(backend.set(f"key-{index}", b"1") for index in range(20)))
+
+    assert server.connections <= 2
+    assert len(backend._idle) == server.connections
+
+
+@pytest.mark.anyio
+async def test_error_reply_keeps_the_connection(server, backend):
+    await backend.get("a")
+
+    with pytest.raises(RedisReplyError, match="unknown command"):
+        await backend.execute("FOO")
+
+    assert await backend.get("a") is None
+    assert server.connections == 1
+
+
+@pytest.mark.anyio
+async def test_error_element_keeps_the_connection(server, backend):
+    server.replies["FOO"] = b"*3\r\n:1\r\n-ERR second\r\n$1\r\nx\r\n"
+
+    with pytest.raises(RedisReplyError, match="second"):
+        await backend.execute("FOO")
+
+    # the elements after the error were read with it
+    await backend.set("a", b"1")
+    assert await backend.get("a") == b"1"
+    assert server.connections == 1
+
+
+@pytest.mark.parametrize("reply", [b"!bogus\r\n", b"$x\r\n", b":1.5\r\n"])
+@pytest.mark.anyio
+async def test_unexpected_reply_drops_the_connection(server, backend, reply):
+    await backend.set("a", b"1")
+    server.replies["FOO"] = reply
+
+    with pytest.raises(CacheBackendError, match="Unexpected redis reply") as e:
+        await backend.execute("FOO")
+    assert not isinstance(e.value, RedisReplyError)
+    assert backend._idle == []
+
+    assert await backend.get("a") == b"1"
+    assert server.connections == 2
+
+
+@pytest.mark.anyio
+async def test_timeout_drops_the_connection(server, backend):
+    await backend.set("a", b"1")
+    server.delay = 0.5
+
+    with pytest.raises(CacheBackendError, match="unavailable"):
+        await backend.get("a")
+    assert backend._idle == []
+
+    # the late reply went to the dropped connection, not to the next command
+    server.delay = 0
+    assert await backend.get("a") == b"1"
+    assert server.connections == 2
+
+
+@pytest.mark.anyio
+async def test_reconnects_after_the_server_closes_connections(server, backend):
+    await backend.set("a", b"1")
+    server.drop_connections()
+    await asyncio.sleep(0.01)
+
+    with pytest.raises(CacheBackendError, match="Connection closed"):
+        await backend.get("a")
+    assert backend._idle == []
+
+    assert await backend.get("a") == b"1"
+    assert server.connections == 2
+
+
+@pytest.mark.anyio
+async def test_authenticates_new_connections():
+    server = FakeRedisServer(password="secret")
+    await server.start()
+    backend = RedisCacheBackend(server.url)
+    try:
+        await backend.set("a", b"1")
+
+        assert server.commands[0] == [b"AUTH", b"secret"]
+        assert await backend.get("a") == b"1"
+    finally:
+        await backend.close()
+        await server.stop()
+
+
+@pytest.mark.anyio
+async def test_unreachable_server_degrades_to_misses(server):
+    url = server.url
+    await server.stop()
+    cache = Cache(RedisCacheBackend(url, timeout=0.2))
+
+    await cache.set("a", 1)
+
+    assert await cache.get("a") is None
+    assert (cache.stats.errors, cache.stats.misses) == (2, 1)
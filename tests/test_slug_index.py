@@ -0,0 +1,75 @@
+import struct
+import pytest
+from apps.blogs.slug_index import HEADER, MAGIC, VERSION, SlugIndex, SlugSnapshot
+
+SLUGS = [f"post-{index}" for index in range(500)]
+
+
+@pytest.fixture
+def index(tmp_path):
+    index = SlugIndex(tmp_path)
+    index.rebuild(SLUGS)
+    return index
+
+
+def index_file(index: SlugIndex):
+    (path,) = index.directory.glob("slugs-*.idx")
+    return path
+
+
+def test_membership(index):
+    assert all(slug in index for slug in SLUGS)
+    assert "post-500" not in index
+    assert "" not in index
+
+
+def test_overlay(index):
+    index.add("new-post")
+    index.remove("post-1")
+
+    assert "new-post" in index
+    assert "post-1" not in index
+    assert "post-2" in index
+
+
+def test_valid_file_is_reused(index):
+    path = index_file(index)
+    written = path.stat().st_mtime_ns
+
+    other = SlugIndex(index.directory)
+    other.rebuild(reversed(SLUGS))
+
+    assert path.stat().st_mtime_ns == written
+    assert all(slug in other for slug in SLUGS)
+
+
+@pytest.mark.parametrize(
+    "corrupt",
+    [
+        lambda data: data[: len(data) // 2],
+        lambda data: data + b"trailing",
+        lambda data: b"",
+        lambda data: HEADER.pack(b"SLUGIDX1", VERSION, 1, 64, 0, 0),
+        lambda data: struct.pack("<8sI", MAGIC, VERSION + 1) + data[12:],
+    ],
+    ids=["truncated", "trailing", "empty", "magic", "version"],
+)
+def test_invalid_file_is_rewritten(index, corrupt):
+    path = index_file(index)
+    path.write_bytes(corrupt(path.read_bytes()))
+
+    other = SlugIndex(index.directory)
+    other.rebuild(SLUGS)
+
+    assert all(slug in other for slug in SLUGS)
+    SlugSnapshot(path).close()
+
+
+def test_file_of_other_slugs_is_rewritten(index):
+    path = index_file(index)
+    SlugSnapshot.write(path, sorted(slug.encode() for slug in SLUGS[:10]))
+
+    other = SlugIndex(index.directory)
+    other.rebuild(SLUGS)
+
+    assert all(slug in other for slug in SLUGS)
@@ -0,0 +1,47 @@
+from apps.blogs.suggest import PrefixIndex, Suggestion
+
+
+def blog(id: int, text: str) -> Suggestion:
+    return Suggestion(type="blog", id=id, slug=f"post-{id}", text=text)
+
+
+def texts(suggestions: list[Suggestion]) -> list[str]:
+    return [suggestion.text for suggestion in suggestions]
+
+
+def test_texts_starting_with_the_prefix_first():
+    index = PrefixIndex()
+    index.rebuild(
+        [blog(1, "Brain health tips"), blog(2, "Tips for the brain"), blog(3, "Brains")]
+    )
+
+    assert texts(index.suggest("brain")) == [
+        "Brains",
+        "Brain health tips",
+        "Tips for the brain",
+    ]
+    assert texts(index.suggest("tips")) == ["Tips for the brain", "Brain health tips"]
+    assert index.suggest("") == [] and index.suggest("zebra") == []
+
+
+def test_later_words_do_not_crowd_out_text_starts():
+    index = PrefixIndex()
+    # every "b a..." later word key sorts before the "bz" text start
+    index.rebuild(
+        [blog(id, f"post b a{id:03}") for id in range(1, 200)] + [blog(500, "Bz")]
+    )
+
+    assert texts(index.suggest("b", limit=3))[0] == "Bz"
+    assert len(index.suggest("b", limit=3)) == 3
+
+
+def test_add_and_remove():
+    index = PrefixIndex()
+    index.rebuild([blog(1, "Brain health"), blog(2, "Healthy food")])
+
+    index.add(blog(1, "Sleep and health"))
+    index.remove("blog", 2)
+
+    assert texts(index.suggest("health")) == ["Sleep and health"]
+    assert index.suggest("brain") == []
+    assert len(index) == 1